@@ -9,9 +9,16 @@ for pregnant women with gestational diabetes.
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
+import sys
 from pathlib import Path
 
+APP_DIR = Path(__file__).resolve().parent
+
+sys.path.insert(0, str(APP_DIR.parent))
+from src.features import compute_features, estimate_glycemic_index
+from src.inference import (default_model_path, load_model_bundle, meal_recommendations,
+                           predict_risk, risk_tier, rule_risk_score, warm_up)
+
 # Page configuration
 st.set_page_config(
     page_title="GD Meal Risk Predictor",
@@ -56,6 +63,18 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource(max_entries=1, show_spinner="Loading model...")
+def load_model_session(model_path, mtime_ns):
+    """
+    Load and warm up the model once per process
+    
+    mtime_ns is part of the cache key, so retraining (which rewrites the
+    model) triggers exactly one reload.
+    """
+    bundle = load_model_bundle(model_path)
+    warm_up(bundle)
+    return bundle
+
 # Header
 st.markdown('<div class="main-header">🍽️ Gestational Diabetes Meal Risk Predictor</div>', 
             unsafe_allow_html=True)
@@ -93,18 +112,20 @@ with tab1:
     st.header("Enter Meal Information")
     
     # Check if model exists
-    model_path = Path("model.pkl")
-    preprocessor_path = Path("preprocessor.pkl")
+    model_path = default_model_path(APP_DIR)
     
-    if not model_path.exists():
-        st.warning("⚠️ Model not found. Please train the model first (see Notebook 03).")
+    if model_path.exists():
+        # Cheap stat() per rerun; the load happens only when the model changes
+        model_bundle = load_model_session(str(model_path), model_path.stat().st_mtime_ns)
+    else:
+        model_bundle = None
+        st.warning("⚠️ Model not found - using the rule-based score (GI, carbs, fiber, glycemic load).")
         st.info("""
-        **To use this app:**
+        **To use the trained model:**
         1. Complete Notebooks 01-03
         2. Train and save your model
         3. Copy `model.pkl` and `preprocessor.pkl` to the `app/` directory
         """)
-        st.stop()
     
     col1, col2, col3 = st.columns(3)
     
@@ -132,11 +153,17 @@ with tab1:
                                    value=300.0, step=10.0)
         gi = st.slider("Glycemic Index (if known)", min_value=0, max_value=100, 
                        value=55, help="Leave at 55 if unknown")
+        gi_unknown = st.checkbox("I don't know the GI",
+                                 help="Estimate GI from carbs and fiber, as the data pipeline does")
         
     # Calculate derived features
     if st.button("🔮 Predict Risk", type="primary", use_container_width=True):
-        # Create feature dictionary
-        features = {
+        if gi_unknown:
+            gi = estimate_glycemic_index(total_carbs, fiber)
+        
+        # Base inputs; derived features come from the shared registry, and only
+        # the ones this screen uses are computed
+        inputs = {
             'total_carbs_g': total_carbs,
             'fiber_g': fiber,
             'sugar_g': sugar,
@@ -146,31 +173,14 @@ with tab1:
             'energy_kcal': calories,
             'glycemic_index': gi
         }
+        features = {name: float(value) for name, value in
+                    compute_features(inputs, ['glycemic_load', 'carb_quality_ratio']).items()}
         
-        # Calculate derived features
-        features['glycemic_load'] = (gi * total_carbs) / 100
-        features['carb_quality_ratio'] = fiber / total_carbs if total_carbs > 0 else 0
-        features['fat_to_carb_ratio'] = fat / total_carbs if total_carbs > 0 else 0
-        features['net_carbs_g'] = total_carbs - fiber
-        features['sugar_pct_carbs'] = (sugar / total_carbs * 100) if total_carbs > 0 else 0
-        features['protein_to_carb_ratio'] = protein / total_carbs if total_carbs > 0 else 0
-        features['high_sugar'] = 1 if sugar > 15 else 0
-        features['low_fiber'] = 1 if fiber < 3 else 0
-        features['high_carb'] = 1 if total_carbs > 45 else 0
-        
-        # Load model and predict (placeholder)
-        # TODO: Implement actual model loading and prediction
-        
-        # For now, use rule-based prediction
-        risk_score = 0
-        if gi > 70:
-            risk_score += 0.3
-        if total_carbs > 45:
-            risk_score += 0.2
-        if fiber < 3:
-            risk_score += 0.2
-        if features['glycemic_load'] > 20:
-            risk_score += 0.3
+        # Predict with the cached, pre-warmed model, or the rules if there is none
+        if model_bundle is not None:
+            risk_score = float(predict_risk(model_bundle, inputs)[0])
+        else:
+            risk_score = float(rule_risk_score(inputs)[0])
         
         st.markdown("---")
         st.header("📊 Prediction Results")
@@ -178,11 +188,12 @@ with tab1:
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            if risk_score > 0.6:
+            tier = risk_tier(risk_score)
+            if tier == 'high':
                 st.markdown('<div class="risk-box high-risk">⚠️ HIGH RISK</div>', 
                            unsafe_allow_html=True)
                 st.error("This meal may cause a significant glucose spike.")
-            elif risk_score > 0.4:
+            elif tier == 'moderate':
                 st.markdown('<div class="risk-box medium-risk">⚠ MODERATE RISK</div>', 
                            unsafe_allow_html=True)
                 st.warning("This meal may cause a moderate glucose response.")
@@ -198,22 +209,11 @@ with tab1:
         
         # Recommendations
         st.subheader("💡 Recommendations")
-        recommendations = []
-        
-        if total_carbs > 45:
-            recommendations.append("• Consider reducing portion size to lower total carbs")
-        if fiber < 5:
-            recommendations.append("• Add more fiber (vegetables, whole grains, legumes)")
-        if gi > 70:
-            recommendations.append("• Choose lower GI alternatives (brown rice instead of white)")
-        if fat < 5 and total_carbs > 30:
-            recommendations.append("• Add healthy fats to slow carb absorption (nuts, avocado, olive oil)")
-        if protein < 15:
-            recommendations.append("• Include more protein to stabilize blood sugar")
+        recommendations = meal_recommendations(inputs)
         
         if recommendations:
             for rec in recommendations:
-                st.markdown(rec)
+                st.markdown(f"• {rec}")
         else:
             st.markdown("✅ This meal looks well-balanced!")
 
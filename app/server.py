@@ -0,0 +1,185 @@
+"""
+Gestational Diabetes Meal Risk Predictor
+HTTP Prediction Service
+
+Serves the model trained by scripts/train_models.py without Streamlit's
+per-session script reruns. The model is loaded and warmed once at startup.
+Concurrent requests are coalesced by a micro-batcher into one model call
+(BATCH_MAX_WAIT_MS=0 disables it, and each request then calls the model
+from a thread pool).
+
+Run from the project root:
+    python app/server.py --port 8000
+    (or: uvicorn app.server:app --port 8000)
+
+Endpoints:
+    GET  /health   -> model type and feature count
+    POST /predict  -> one meal as a JSON object, or {"meals": [...]} for a batch
+"""
+
+import asyncio
+import os
+from functools import partial
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+APP_DIR = Path(__file__).resolve().parent
+
+sys.path.insert(0, str(APP_DIR.parent))
+from src.features import BASE_FEATURES, compute_features, meal_feature_matrix
+from src.inference import (MicroBatcher, default_model_path, load_model_bundle,
+                           meal_recommendations, predict_matrix, risk_tier, warm_up)
+
+MODEL_PATH = Path(os.environ.get('MODEL_PATH', default_model_path(APP_DIR)))
+PREDICT_WORKERS = int(os.environ.get('PREDICT_WORKERS', os.cpu_count() or 4))
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 10000))
+BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', 2.0))
+BATCH_MAX_ROWS = int(os.environ.get('BATCH_MAX_ROWS', 256))
+
+
+class InvalidMeal(ValueError):
+    """Request body does not describe valid meals"""
+
+
+def parse_meals(payload):
+    """
+    Validate a request body and turn it into a DataFrame of base features
+    
+    Parameters:
+    -----------
+    payload : dict
+        One meal, or {"meals": [meal, ...]}
+        
+    Returns:
+    --------
+    meals : DataFrame
+        One row per meal, BASE_FEATURES columns as floats
+    batch : bool
+        Whether the request used the batch form
+    """
+    if not isinstance(payload, dict):
+        raise InvalidMeal("Body must be a JSON object")
+    batch = 'meals' in payload
+    meals = payload['meals'] if batch else [payload]
+    if not isinstance(meals, list) or not meals:
+        raise InvalidMeal("'meals' must be a non-empty list")
+    if len(meals) > MAX_BATCH_SIZE:
+        raise InvalidMeal(f"At most {MAX_BATCH_SIZE} meals per request")
+
+    rows = []
+    for i, meal in enumerate(meals):
+        if not isinstance(meal, dict):
+            raise InvalidMeal(f"Meal {i} must be a JSON object")
+        missing = [name for name in BASE_FEATURES if name not in meal]
+        if missing:
+            raise InvalidMeal(f"Meal {i} is missing: {', '.join(missing)}")
+        try:
+            rows.append([float(meal[name]) for name in BASE_FEATURES])
+        except (TypeError, ValueError):
+            raise InvalidMeal(f"Meal {i} has non-numeric values")
+    return pd.DataFrame(rows, columns=BASE_FEATURES), batch
+
+
+def format_predictions(meals, probabilities):
+    """
+    Build the response entries for scored meals
+    
+    Parameters:
+    -----------
+    meals : DataFrame
+        Output of parse_meals()
+    probabilities : ndarray
+        P(high risk) per meal
+        
+    Returns:
+    --------
+    results : list of dict
+        risk_probability, risk_level, glycemic_load and recommendations per meal
+    """
+    glycemic_load = compute_features(meals, ['glycemic_load'])['glycemic_load']
+    return [
+        {
+            'risk_probability': float(probability),
+            'risk_level': risk_tier(probability),
+            'glycemic_load': float(load),
+            'recommendations': meal_recommendations(meal)
+        }
+        for probability, load, meal in zip(probabilities, glycemic_load,
+                                           meals.to_dict('records'))
+    ]
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Concurrency comes from the worker pool, so each prediction runs single-threaded
+    app.state.bundle = load_model_bundle(MODEL_PATH, n_jobs=1)
+    warm_up(app.state.bundle)
+    app.state.executor = ThreadPoolExecutor(max_workers=PREDICT_WORKERS)
+    app.state.batcher = None
+    if BATCH_MAX_WAIT_MS > 0:
+        app.state.batcher = MicroBatcher(partial(predict_matrix, app.state.bundle),
+                                         max_batch_size=BATCH_MAX_ROWS,
+                                         max_wait_ms=BATCH_MAX_WAIT_MS)
+    try:
+        yield
+    finally:
+        if app.state.batcher is not None:
+            app.state.batcher.close()
+        app.state.executor.shutdown(wait=False)
+
+
+async def health(request):
+    bundle = request.app.state.bundle
+    return JSONResponse({
+        'status': 'ok',
+        'model_type': bundle['model_type'],
+        'n_features': len(bundle['feature_names'])
+    })
+
+
+async def predict(request):
+    try:
+        meals, batch = parse_meals(await request.json())
+    except InvalidMeal as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+    except ValueError:
+        return JSONResponse({'error': "Body must be valid JSON"}, status_code=400)
+
+    bundle = request.app.state.bundle
+    X = meal_feature_matrix(meals, bundle['feature_names'])
+    if request.app.state.batcher is not None:
+        probabilities = await asyncio.wrap_future(request.app.state.batcher.submit(X))
+    else:
+        loop = asyncio.get_running_loop()
+        probabilities = await loop.run_in_executor(request.app.state.executor,
+                                                   predict_matrix, bundle, X)
+    results = format_predictions(meals, probabilities)
+    return JSONResponse({'predictions': results} if batch else results[0])
+
+
+app = Starlette(
+    routes=[
+        Route('/health', health, methods=['GET']),
+        Route('/predict', predict, methods=['POST']),
+    ],
+    lifespan=lifespan
+)
+
+
+if __name__ == '__main__':
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Meal risk prediction service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import pickle
+from src.features import FEATURE_COLUMNS
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
@@ -25,11 +26,7 @@ print(f"   ✓ Loaded {len(df)} meals with {len(df.columns)} features")
 
 # Prepare data
 print("\n2. Preparing features and target...")
-feature_cols = ['total_carbs_g', 'fiber_g', 'sugar_g', 'protein_g', 'fat_g',
-                'saturated_fat_g', 'energy_kcal', 'glycemic_index', 'glycemic_load',
-                'carb_quality_ratio', 'fat_to_carb_ratio', 'net_carbs_g',
-                'sugar_pct_carbs', 'protein_to_carb_ratio', 'high_sugar',
-                'low_fiber', 'high_carb']
+feature_cols = list(FEATURE_COLUMNS)
 
 X = df[feature_cols]
 y = df['high_risk']
@@ -0,0 +1,78 @@
+"""
+Benchmark: feature table handoff from feature engineering to training
+Compares writing and loading meals_with_features as CSV (pd.read_csv) with
+the memory-mapped Arrow IPC file from src/data_prep.py
+
+Usage:
+    python scripts/benchmark_feature_handoff.py
+    python scripts/benchmark_feature_handoff.py --rows 100000
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.data_prep import load_feature_table, save_feature_table
+from src.features import FEATURE_COLUMNS, create_meal_features, create_risk_labels
+
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+from benchmark_features import synthetic_meals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the features -> training handoff")
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK: FEATURE TABLE HANDOFF")
+    print("=" * 80)
+
+    meals = create_meal_features(synthetic_meals(args.rows))
+    meals.insert(0, 'food_name', [f'Food_{i}' for i in range(len(meals))])
+    meals['high_risk'] = create_risk_labels(meals)
+    print(f"\nInput: {len(meals):,} meals, {len(FEATURE_COLUMNS)} features")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'meals_with_features.csv'
+        arrow_path = Path(tmp) / 'meals_with_features.feather'
+
+        start = time.perf_counter()
+        meals.to_csv(csv_path, index=False)
+        csv_write = time.perf_counter() - start
+        start = time.perf_counter()
+        from_csv = pd.read_csv(csv_path)[FEATURE_COLUMNS + ['high_risk']]
+        csv_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        save_feature_table(meals, arrow_path)
+        arrow_write = time.perf_counter() - start
+        start = time.perf_counter()
+        from_arrow = load_feature_table(arrow_path)
+        arrow_read = time.perf_counter() - start
+
+        # What training does next: materialise the feature matrix
+        start = time.perf_counter()
+        from_arrow[FEATURE_COLUMNS].to_numpy()
+        arrow_matrix = time.perf_counter() - start
+
+        same = (np.allclose(from_csv[FEATURE_COLUMNS].to_numpy(), from_arrow[FEATURE_COLUMNS].to_numpy())
+                and (from_csv['high_risk'].to_numpy() == from_arrow['high_risk'].to_numpy()).all())
+
+        print(f"\n{'Format':<14} {'Write (s)':<12} {'Load (s)':<12} {'Size (MB)':<12}")
+        print("-" * 50)
+        print(f"{'CSV':<14} {csv_write:<12.3f} {csv_read:<12.3f} {csv_path.stat().st_size / 1e6:<12.1f}")
+        print(f"{'Arrow IPC':<14} {arrow_write:<12.3f} {arrow_read:<12.4f} {arrow_path.stat().st_size / 1e6:<12.1f}")
+        print(f"\nLoad speed-up: {csv_read / arrow_read:.0f}x "
+              f"({csv_read / (arrow_read + arrow_matrix):.0f}x including the feature matrix copy)")
+        print(f"Matching features and labels: {'✓' if same else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
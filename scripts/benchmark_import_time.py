@@ -0,0 +1,109 @@
+"""
+Benchmark: cold-start import time of the command-line tools and services
+Runs each entry point in a fresh interpreter under `python -X importtime`,
+reports the import cost and the heaviest packages, and fails if an entry
+point goes over its time budget or imports a backend it should not need
+
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --repeat 5 --scale 2   # slower machine
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# name: (python arguments, budget in seconds, packages that must not be imported)
+ENTRY_POINTS = {
+    'Batch scorer': (['scripts/score_meals.py', '--help'], 1.0, ['sklearn', 'xgboost', 'scipy']),
+    'Exported model': (['-c', "from src.inference import load_model_bundle; load_model_bundle('app/model')"],
+                       1.0, ['sklearn', 'xgboost', 'scipy']),
+    'Prediction service': (['-c', "import sys; sys.path.insert(0, 'app'); import server"],
+                           1.5, ['sklearn', 'xgboost', 'scipy']),
+    'Pipeline runner': (['scripts/run_complete_pipeline.py', '--dry-run'], 0.3, ['pandas', 'numpy']),
+    'Training library': (['-c', 'import src.train_model'], 0.5, ['sklearn', 'xgboost', 'pandas']),
+    'Feature table IO': (['-c', 'import src.data_prep'], 1.0, ['sklearn', 'scipy', 'xgboost']),
+}
+
+
+def import_profile(args):
+    """
+    Run `python -X importtime <args>` and parse its report
+    
+    Parameters:
+    -----------
+    args : list of str
+        Arguments after the interpreter flags
+        
+    Returns:
+    --------
+    total : float
+        Seconds spent importing (sum over top-level imports)
+    packages : dict
+        {top-level package: seconds}, every package imported at any depth,
+        timed at its outermost import
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=PROJECT_ROOT,
+                            capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'})
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+
+    total = 0.0
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        seconds = int(cumulative) / 1e6
+        if not name.startswith('  '):
+            total += seconds  # nested imports are inside their parent's cumulative time
+        package = name.strip().split('.')[0]
+        packages[package] = max(packages.get(package, 0.0), seconds)
+    return total, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per entry point (best is kept)")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply every budget")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK: IMPORT TIME")
+    print("=" * 80)
+
+    failures = []
+    print(f"\n{'Entry point':<20} {'Imports (s)':<12} {'Budget (s)':<12} {'Heaviest packages'}")
+    print("-" * 80)
+    for name, (command, budget, forbidden) in ENTRY_POINTS.items():
+        if name == 'Exported model' and not (PROJECT_ROOT / 'app' / 'model').exists():
+            print(f"{name:<20} {'-':<12} {'-':<12} skipped (no app/model, run scripts/train_models.py)")
+            continue
+        runs = [import_profile(command) for _ in range(args.repeat)]
+        total, packages = min(runs, key=lambda run: run[0])
+        heaviest = sorted(((package, seconds) for package, seconds in packages.items()
+                           if package not in ('src', 'server', 'site')), key=lambda item: -item[1])[:3]
+        print(f"{name:<20} {total:<12.3f} {budget * args.scale:<12.2f} "
+              + ", ".join(f"{package} {seconds:.2f}" for package, seconds in heaviest))
+
+        if total > budget * args.scale:
+            failures.append(f"{name}: {total:.3f}s of imports, budget {budget * args.scale:.2f}s")
+        loaded = sorted(set(forbidden) & set(packages))
+        if loaded:
+            failures.append(f"{name}: imports {', '.join(loaded)}")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"⚠️  {failure}")
+        sys.exit(1)
+    print("✓ All entry points within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: micro-batched vs per-request predictions
+Simulates 1, 10 and 100 concurrent callers each scoring single meals
+against the model in app/, with and without MicroBatcher
+
+Usage:
+    python scripts/benchmark_micro_batching.py
+    python scripts/benchmark_micro_batching.py --model models/xgboost.pkl --max-wait-ms 5
+"""
+
+import argparse
+import sys
+import time
+import threading
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.features import BASE_FEATURES, meal_feature_matrix
+from src.inference import (MicroBatcher, default_model_path, load_model_bundle,
+                           predict_matrix, warm_up)
+
+
+def run_callers(predict, rows, n_callers, per_caller):
+    """Each caller thread scores per_caller single rows back to back"""
+    latencies = [[] for _ in range(n_callers)]
+    barrier = threading.Barrier(n_callers + 1)
+
+    def caller(i):
+        barrier.wait()
+        for j in range(per_caller):
+            x = rows[(i * per_caller + j) % len(rows)]
+            start = time.perf_counter()
+            predict(x)
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(n_callers)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return n_callers * per_caller / elapsed, np.concatenate(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark micro-batching")
+    parser.add_argument('--model', default=str(default_model_path(PROJECT_ROOT / 'app')))
+    parser.add_argument('--requests', type=int, default=2000,
+                        help="Total single-meal predictions per scenario")
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    bundle = load_model_bundle(args.model, n_jobs=1)
+    warm_up(bundle)
+
+    rng = np.random.default_rng(42)
+    meals = {name: rng.uniform(0, 90, 1000) for name in BASE_FEATURES}
+    rows = meal_feature_matrix(meals, bundle['feature_names'])
+
+    print("=" * 80)
+    print("BENCHMARK: MICRO-BATCHING")
+    print("=" * 80)
+    print(f"\nModel: {bundle['model_type']} | max batch {args.max_batch_size} rows, "
+          f"max wait {args.max_wait_ms} ms")
+
+    print(f"\n{'Callers':<9} {'Mode':<10} {'Pred/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'Avg batch':>10}")
+    print("-" * 60)
+    for n_callers in [1, 10, 100]:
+        per_caller = max(args.requests // n_callers, 1)
+
+        direct = partial(predict_matrix, bundle)
+        throughput, latency = run_callers(lambda x: direct(x[None, :]), rows, n_callers, per_caller)
+        print(f"{n_callers:<9} {'direct':<10} {throughput:>10,.0f} "
+              f"{np.percentile(latency, 50):>9.2f} {np.percentile(latency, 99):>9.2f} {1:>10.1f}")
+        direct_throughput = throughput
+
+        batcher = MicroBatcher(direct, max_batch_size=args.max_batch_size,
+                               max_wait_ms=args.max_wait_ms)
+        throughput, latency = run_callers(batcher.predict, rows, n_callers, per_caller)
+        batcher.close()
+        print(f"{n_callers:<9} {'batched':<10} {throughput:>10,.0f} "
+              f"{np.percentile(latency, 50):>9.2f} {np.percentile(latency, 99):>9.2f} "
+              f"{batcher.rows / batcher.batches:>10.1f}")
+        print(f"{'':<9} speed-up: {throughput / direct_throughput:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
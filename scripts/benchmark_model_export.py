@@ -0,0 +1,96 @@
+"""
+Benchmark: pickled model vs pickle-free export
+Measures cold start (fresh interpreter: import, load, first prediction),
+single-row latency and agreement for a model.pkl and its export directory.
+
+Usage:
+    python scripts/benchmark_model_export.py
+    python scripts/benchmark_model_export.py --pickle models/xgboost.pkl --export models/xgboost
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.features import BASE_FEATURES, meal_feature_matrix
+from src.inference import load_model_bundle, predict_matrix
+
+# Run in a fresh interpreter so import and load costs are not already paid
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.inference import load_model_bundle, warm_up
+bundle = load_model_bundle({path!r})
+warm_up(bundle)
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                  'sklearn_imported': 'sklearn' in sys.modules}}))
+"""
+
+
+def cold_start(path, runs):
+    """Best-of-runs seconds to import, load and score once, and whether sklearn got imported"""
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', COLD_START.format(root=str(PROJECT_ROOT), path=str(path))],
+                             capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(r['seconds'] for r in results), results[0]['sklearn_imported']
+
+
+def row_latency_ms(bundle, X, calls=500):
+    """Mean milliseconds per single-row predict_matrix call"""
+    predict_matrix(bundle, X[:1])
+    start = time.perf_counter()
+    for i in range(calls):
+        predict_matrix(bundle, X[i % len(X):i % len(X) + 1])
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pickled vs exported models")
+    parser.add_argument('--pickle', default=str(PROJECT_ROOT / 'app' / 'model.pkl'))
+    parser.add_argument('--export', default=str(PROJECT_ROOT / 'app' / 'model'))
+    parser.add_argument('--runs', type=int, default=3, help="Cold starts per format")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK: PICKLED VS EXPORTED MODEL")
+    print("=" * 80)
+
+    rng = np.random.default_rng(42)
+    meals = {name: rng.uniform(0, 100, 10000) for name in BASE_FEATURES}
+
+    results = {}
+    for label, path in [('pickle', args.pickle), ('export', args.export)]:
+        bundle = load_model_bundle(path)
+        X = meal_feature_matrix(meals, bundle['feature_names'])
+        seconds, sklearn_imported = cold_start(path, args.runs)
+        results[label] = {
+            'cold_start': seconds,
+            'sklearn': sklearn_imported,
+            'row_ms': row_latency_ms(bundle, X),
+            'p': predict_matrix(bundle, X)
+        }
+    print(f"\nModel: {bundle['model_type']}")
+
+    print(f"\n{'Format':<8} {'Cold start (s)':>15} {'Row latency (ms)':>17} {'sklearn imported':>17}")
+    print("-" * 60)
+    for label, r in results.items():
+        print(f"{label:<8} {r['cold_start']:>15.3f} {r['row_ms']:>17.3f} {str(r['sklearn']):>17}")
+
+    max_diff = np.max(np.abs(results['pickle']['p'] - results['export']['p']))
+    print(f"\nCold start speed-up:  {results['pickle']['cold_start'] / results['export']['cold_start']:.1f}x")
+    print(f"Row latency speed-up: {results['pickle']['row_ms'] / results['export']['row_ms']:.1f}x")
+    print(f"Max |Δp| over {len(X):,} meals: {max_diff:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: rule-based risk score vs the trained model vs the cascade
+Times both scorers on synthetic meals at several batch sizes and reports
+how often their risk tiers agree. The rule score is the baseline the
+model has to beat, and the fallback when no model is trained; the cascade
+runs the model only where the rules are unsure.
+
+Usage:
+    python scripts/benchmark_risk_scorers.py
+    python scripts/benchmark_risk_scorers.py --model models/xgboost.pkl
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.features import BASE_FEATURES, meal_feature_matrix
+from src.inference import (default_model_path, load_model_bundle, predict_cascade,
+                           predict_matrix, risk_tiers, rule_risk_score, warm_up)
+
+BATCH_SIZES = [1, 100, 100000]
+
+
+def synthetic_meals(n, seed=42):
+    """Random meals over the ranges the app accepts"""
+    rng = np.random.default_rng(seed)
+    meals = {name: rng.uniform(0, 60, n) for name in BASE_FEATURES}
+    meals['total_carbs_g'] = rng.uniform(0, 120, n)
+    meals['fiber_g'] = rng.uniform(0, 12, n)
+    meals['glycemic_index'] = rng.uniform(10, 100, n)
+    return meals
+
+
+def time_scorer(score, meals, batch_size, min_seconds=0.5):
+    """Meals per second and mean ms per call for score(batch)"""
+    batch = {name: values[:batch_size] for name, values in meals.items()}
+    score(batch)
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        score(batch)
+        calls += 1
+    elapsed = time.perf_counter() - start
+    return calls * batch_size / elapsed, elapsed / calls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rule-based vs model risk scoring")
+    parser.add_argument('--model', default=str(default_model_path(PROJECT_ROOT / 'app')))
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK: RISK SCORERS")
+    print("=" * 80)
+
+    meals = synthetic_meals(max(BATCH_SIZES))
+    scorers = {'rules': rule_risk_score}
+    if Path(args.model).exists():
+        bundle = load_model_bundle(args.model)
+        warm_up(bundle)
+        # Feature building is part of the model's cost, so time it too
+        scorers[bundle['model_type']] = lambda data: predict_matrix(
+            bundle, meal_feature_matrix(data, bundle['feature_names']))
+        scorers['cascade'] = lambda data: predict_cascade(bundle, data)[0]
+    else:
+        print(f"\n⚠️  No model at {args.model} - timing the rule-based score only")
+
+    print(f"\n{'Scorer':<16} {'Batch':>8} {'Meals/s':>14} {'ms/call':>10}")
+    print("-" * 52)
+    for name, score in scorers.items():
+        for batch_size in BATCH_SIZES:
+            throughput, ms = time_scorer(score, meals, batch_size)
+            print(f"{name:<16} {batch_size:>8,} {throughput:>14,.0f} {ms:>10.3f}")
+
+    if len(scorers) > 1:
+        rule_tiers = risk_tiers(scorers['rules'](meals))
+        model_tiers = risk_tiers(scorers[bundle['model_type']](meals))
+        cascade_tiers = risk_tiers(scorers['cascade'](meals))
+        print(f"\nTier agreement with {bundle['model_type']} over {len(model_tiers):,} meals:")
+        print(f"   rules:   {np.mean(rule_tiers == model_tiers):.1%}")
+        print(f"   cascade: {np.mean(cascade_tiers == model_tiers):.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: NumPy tree-ensemble evaluator vs sklearn's RandomForest predict_proba
+Packs the random forest trained by train_models.py into a TreeEnsemble and
+times both at batch sizes 1, 100 and 100k.
+
+Usage:
+    python scripts/benchmark_tree_evaluator.py
+    python scripts/benchmark_tree_evaluator.py --model models/random_forest.pkl --block-size 2048
+"""
+
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.features import BASE_FEATURES, FEATURE_COLUMNS, meal_feature_matrix
+from src.model_export import TreeEnsemble
+
+BATCH_SIZES = [1, 100, 100000]
+
+
+def time_calls(func, X, min_seconds=1.0):
+    """Mean seconds per func(X) call, after one warm-up call"""
+    func(X)
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        func(X)
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy tree-ensemble evaluator")
+    parser.add_argument('--model', default=str(PROJECT_ROOT / 'models' / 'random_forest.pkl'))
+    parser.add_argument('--block-size', type=int, default=256, help="Rows evaluated together")
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        forest = pickle.load(f)['model']
+    feature_names = list(getattr(forest, 'feature_names_in_', FEATURE_COLUMNS))
+
+    print("=" * 80)
+    print("BENCHMARK: NUMPY TREE-ENSEMBLE EVALUATOR")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    ensemble = TreeEnsemble.from_sklearn(forest, block_size=args.block_size)
+    print(f"\nForest: {len(forest.estimators_)} trees, {len(ensemble.feature):,} nodes, "
+          f"max depth {ensemble.max_depth} (packed in {time.perf_counter() - start:.3f}s)")
+    print(f"sklearn n_jobs: {forest.n_jobs}")
+
+    rng = np.random.default_rng(42)
+    meals = {name: rng.uniform(0, 100, max(BATCH_SIZES)) for name in BASE_FEATURES}
+    X_all = meal_feature_matrix(meals, feature_names)
+
+    def sklearn_predict(X):
+        return forest.predict_proba(pd.DataFrame(X, columns=feature_names))[:, 1]
+
+    def numpy_predict(X):
+        return ensemble.leaf_values(X).mean(axis=1)
+
+    print(f"\n{'Batch':>8} {'sklearn ms':>12} {'NumPy ms':>10} {'Speed-up':>9} {'NumPy rows/s':>14}")
+    print("-" * 58)
+    for batch_size in BATCH_SIZES:
+        X = X_all[:batch_size]
+        sklearn_s = time_calls(sklearn_predict, X)
+        numpy_s = time_calls(numpy_predict, X)
+        print(f"{batch_size:>8,} {sklearn_s * 1000:>12.3f} {numpy_s * 1000:>10.3f} "
+              f"{sklearn_s / numpy_s:>8.1f}x {batch_size / numpy_s:>14,.0f}")
+
+    max_diff = np.max(np.abs(sklearn_predict(X_all) - numpy_predict(X_all)))
+    print(f"\nMax |Δp| vs predict_proba over {len(X_all):,} meals: {max_diff:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: long -> wide nutrient table
+Compares pandas pivot_table(aggfunc='first') with the scatter-based
+nutrients_to_wide() on a FoodData Central release (or synthetic rows)
+
+Usage:
+    python scripts/benchmark_wide_format.py
+    python scripts/benchmark_wide_format.py --synthetic 2000000
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import argparse
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_RAW = PROJECT_ROOT / 'data' / 'raw'
+
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.data_prep import stream_usda_nutrients, nutrients_to_wide
+
+NUTRIENT_MAP = {
+    1003: 'protein_g',
+    1004: 'fat_g',
+    1005: 'total_carbs_g',
+    1008: 'energy_kcal',
+    1079: 'fiber_g',
+    1063: 'sugar_g',
+    1258: 'saturated_fat_g',
+    1087: 'calcium_mg',
+    1089: 'iron_mg'
+}
+
+
+def pivot_wide(nutrient_df):
+    """Original pivot_table implementation from process_usda_data.py"""
+    nutrient_wide = nutrient_df.pivot_table(
+        index='fdc_id',
+        columns='nutrient_id',
+        values='amount',
+        aggfunc='first'
+    ).reset_index()
+    nutrient_wide.columns = ['fdc_id'] + [NUTRIENT_MAP.get(col, f'nutrient_{col}')
+                                           for col in nutrient_wide.columns[1:]]
+    return nutrient_wide
+
+
+def best_of(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nutrient pivot implementations")
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="Use N synthetic foods instead of data/raw/food_nutrient.csv")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BENCHMARK: NUTRIENT LONG -> WIDE")
+    print("=" * 80)
+
+    if args.synthetic:
+        rng = np.random.default_rng(42)
+        fdc_id = np.repeat(np.arange(args.synthetic, dtype=np.int32), len(NUTRIENT_MAP))
+        nutrient_id = np.tile(np.array(list(NUTRIENT_MAP), dtype=np.int32), args.synthetic)
+        nutrient_df = pd.DataFrame({
+            'fdc_id': fdc_id,
+            'nutrient_id': nutrient_id,
+            'amount': rng.uniform(0, 100, len(fdc_id)).astype(np.float32)
+        }).sample(frac=1.0, random_state=42)
+        print(f"\nSynthetic input: {len(nutrient_df):,} rows")
+    else:
+        print("\nLoading every food's nutrients from data/raw/food_nutrient.csv...")
+        food_ids = pd.read_csv(DATA_RAW / 'food.csv', usecols=['fdc_id'])['fdc_id']
+        nutrient_df = stream_usda_nutrients(DATA_RAW / 'food_nutrient.csv',
+                                            food_ids, NUTRIENT_MAP.keys())
+        print(f"   ✓ Loaded {len(nutrient_df):,} rows for {food_ids.nunique():,} foods")
+
+    pivot_time, expected = best_of(lambda: pivot_wide(nutrient_df), args.repeats)
+    scatter_time, result = best_of(lambda: nutrients_to_wide(nutrient_df, NUTRIENT_MAP), args.repeats)
+
+    same = (
+        list(expected.columns) == list(result.columns) and
+        np.array_equal(expected['fdc_id'].to_numpy(), result['fdc_id'].to_numpy()) and
+        np.array_equal(expected.iloc[:, 1:].to_numpy(dtype=np.float32),
+                       result.iloc[:, 1:].to_numpy(dtype=np.float32), equal_nan=True)
+    )
+
+    print(f"\n{'Method':<20} {'Best time (s)':<15} {'Output MB':<15}")
+    print("-" * 50)
+    print(f"{'pivot_table':<20} {pivot_time:<15.3f} {expected.memory_usage().sum() / 1e6:<15.1f}")
+    print(f"{'scatter':<20} {scatter_time:<15.3f} {result.memory_usage().sum() / 1e6:<15.1f}")
+    print(f"\nSpeed-up: {pivot_time / scatter_time:.1f}x")
+    print(f"Identical output: {'✓' if same else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Export a pickled model to the pickle-free format read by src/model_export.py
+train_models.py already does this for freshly trained models; use this for
+older model.pkl files.
+
+Usage:
+    python scripts/export_model.py app/model.pkl app/model
+    python scripts/export_model.py models/xgboost.pkl models/xgboost --feature-names app/feature_names.pkl
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.features import BASE_FEATURES, meal_feature_matrix
+from src.inference import load_model_bundle, predict_matrix
+from src.model_export import check_export, export_model, load_exported_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a pickled model without pickle")
+    parser.add_argument('model', help="Pickled model (model.pkl or models/*.pkl)")
+    parser.add_argument('out_dir', help="Export directory (replaced if it exists)")
+    parser.add_argument('--feature-names', help="feature_names.pkl (default: next to the model)")
+    parser.add_argument('--tolerance', type=float, default=1e-6,
+                        help="Largest allowed |difference| from predict_proba")
+    args = parser.parse_args()
+
+    bundle = load_model_bundle(args.model, args.feature_names)
+    out_dir = export_model(bundle, args.out_dir)
+
+    # Check on random meals covering the app's input ranges
+    rng = np.random.default_rng(42)
+    meals = {name: rng.uniform(0, 100, 10000) for name in BASE_FEATURES}
+    X = meal_feature_matrix(meals, bundle['feature_names'])
+    exported, _ = load_exported_model(out_dir)
+    max_diff = check_export(exported, X, predict_matrix(bundle, X), args.tolerance)
+
+    print(f"✓ Exported {bundle['model_type']} to {out_dir}")
+    print(f"✓ Max |Δp| vs predict_proba on {len(X):,} meals: {max_diff:.1e}")
+
+
+if __name__ == '__main__':
+    main()
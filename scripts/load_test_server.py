@@ -0,0 +1,131 @@
+"""
+Load Test for the Prediction Service
+Fires concurrent /predict requests at a local app/server.py and reports
+throughput and p50/p99 latency
+
+Usage:
+    python scripts/load_test_server.py --start-server
+    python scripts/load_test_server.py --url http://127.0.0.1:8000 --concurrency 32 --batch-size 10
+"""
+
+import argparse
+import http.client
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def random_meals(n, rng):
+    return [
+        {
+            'total_carbs_g': float(rng.uniform(0, 100)),
+            'fiber_g': float(rng.uniform(0, 15)),
+            'sugar_g': float(rng.uniform(0, 30)),
+            'protein_g': float(rng.uniform(0, 40)),
+            'fat_g': float(rng.uniform(0, 30)),
+            'saturated_fat_g': float(rng.uniform(0, 10)),
+            'energy_kcal': float(rng.uniform(50, 500)),
+            'glycemic_index': float(rng.uniform(20, 90))
+        }
+        for _ in range(n)
+    ]
+
+
+def wait_for_server(host, port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def run_client(host, port, bodies):
+    """Send bodies over one keep-alive connection; return per-request latencies"""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    latencies = []
+    for body in bodies:
+        start = time.perf_counter()
+        conn.request('POST', '/predict', body=body, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the prediction service")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="Meals per request (1 = single-meal form)")
+    parser.add_argument('--start-server', action='store_true',
+                        help="Start app/server.py for the duration of the test")
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    host, port = url.hostname, url.port or 80
+
+    server = None
+    if args.start_server:
+        server = subprocess.Popen([sys.executable, str(PROJECT_ROOT / 'app' / 'server.py'),
+                                   '--host', host, '--port', str(port)])
+    try:
+        if not wait_for_server(host, port):
+            print(f"❌ No server answering at {args.url}")
+            sys.exit(1)
+
+        rng = np.random.default_rng(42)
+        bodies = []
+        for _ in range(args.requests):
+            meals = random_meals(args.batch_size, rng)
+            bodies.append(json.dumps(meals[0] if args.batch_size == 1 else {'meals': meals}))
+
+        print("=" * 80)
+        print("PREDICTION SERVICE LOAD TEST")
+        print("=" * 80)
+        print(f"\nTarget: {args.url}/predict")
+        print(f"Requests: {args.requests:,} | Concurrency: {args.concurrency} | "
+              f"Meals per request: {args.batch_size}")
+
+        # Warm-up round so connection setup is not measured
+        run_client(host, port, bodies[:10])
+
+        shards = [bodies[i::args.concurrency] for i in range(args.concurrency)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(lambda shard: run_client(host, port, shard), shards))
+        elapsed = time.perf_counter() - start
+
+        latencies = np.concatenate([np.asarray(r) for r in results]) * 1000
+        print(f"\n{'Metric':<20} {'Value':>12}")
+        print("-" * 33)
+        print(f"{'Requests/s':<20} {args.requests / elapsed:>12,.0f}")
+        print(f"{'Meals/s':<20} {args.requests * args.batch_size / elapsed:>12,.0f}")
+        print(f"{'p50 latency (ms)':<20} {np.percentile(latencies, 50):>12.2f}")
+        print(f"{'p99 latency (ms)':<20} {np.percentile(latencies, 99):>12.2f}")
+        print(f"{'max latency (ms)':<20} {latencies.max():>12.2f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -13,21 +13,23 @@ This script:
 import pandas as pd
 import numpy as np
 from pathlib import Path
+import argparse
+import sys
 import time
 
-print("=" * 80)
-print("PROCESSING USDA FOODDATA CENTRAL")
-print("=" * 80)
-
-start_time = time.time()
-
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_RAW = PROJECT_ROOT / 'data' / 'raw'
 DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+DATA_CACHE = PROJECT_ROOT / 'data' / 'cache' / 'usda'
 
-# Ensure output directory exists
-DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.data_prep import (HAS_PYARROW, build_usda_cache, read_usda_table,
+                            stream_usda_nutrients, parallel_usda_nutrients,
+                            nutrients_to_wide, file_digest, hash_usda_rows,
+                            load_usda_manifest, save_usda_manifest, diff_usda_manifest,
+                            merge_nutritional_data)
+from src.features import estimate_glycemic_index
 
 # Key nutrient IDs from USDA database
 NUTRIENT_MAP = {
@@ -42,185 +44,255 @@ NUTRIENT_MAP = {
     1089: 'iron_mg'
 }
 
-print("\nStep 1: Loading food descriptions...")
-print("(This may take a minute for large files)")
-
-# Load foods - filter for foundation and sr_legacy foods (most reliable data)
-food_df = pd.read_csv(
-    DATA_RAW / 'food.csv',
-    usecols=['fdc_id', 'data_type', 'description'],
-    low_memory=False
-)
-
-print(f"   ✓ Loaded {len(food_df):,} total foods")
-print(f"   Food types: {food_df['data_type'].value_counts().to_dict()}")
-
-# Filter for foundation_food and sr_legacy_food (most complete nutritional data)
-food_df = food_df[food_df['data_type'].isin(['foundation_food', 'sr_legacy_food'])].copy()
-print(f"   ✓ Filtered to {len(food_df):,} foundation/SR legacy foods")
-
-print("\nStep 2: Loading nutritional data...")
-print("(This will take 2-3 minutes due to file size)")
-
-# Load nutrients for our filtered foods only
-relevant_fdc_ids = set(food_df['fdc_id'].values)
-
-# Read nutrients in chunks to manage memory
-nutrients_list = []
-chunk_size = 1000000
-
-for chunk in pd.read_csv(DATA_RAW / 'food_nutrient.csv', 
-                          usecols=['fdc_id', 'nutrient_id', 'amount'],
-                          chunksize=chunk_size,
-                          low_memory=False):
-    # Filter for relevant foods and nutrients
-    chunk = chunk[
-        (chunk['fdc_id'].isin(relevant_fdc_ids)) &
-        (chunk['nutrient_id'].isin(NUTRIENT_MAP.keys()))
-    ]
-    nutrients_list.append(chunk)
-    print(f"   Processed chunk... {len(nutrients_list)} chunks so far")
-
-nutrient_df = pd.concat(nutrients_list, ignore_index=True)
-print(f"   ✓ Loaded {len(nutrient_df):,} relevant nutrient records")
-
-print("\nStep 3: Pivoting nutrients to wide format...")
-
-# Pivot nutrients to columns
-nutrient_wide = nutrient_df.pivot_table(
-    index='fdc_id',
-    columns='nutrient_id',
-    values='amount',
-    aggfunc='first'  # Take first value if duplicates
-).reset_index()
-
-# Rename columns using our mapping
-nutrient_wide.columns = ['fdc_id'] + [NUTRIENT_MAP.get(col, f'nutrient_{col}') 
-                                       for col in nutrient_wide.columns[1:]]
-
-print(f"   ✓ Created wide format with {len(nutrient_wide)} foods")
-print(f"   Columns: {nutrient_wide.columns.tolist()}")
-
-print("\nStep 4: Merging with food descriptions...")
-
-# Merge foods with nutrients
-foods_complete = food_df.merge(nutrient_wide, on='fdc_id', how='inner')
-print(f"   ✓ Merged dataset: {len(foods_complete):,} foods with complete nutrition data")
-
-# Remove rows with missing critical nutrients
-critical_nutrients = ['total_carbs_g', 'protein_g', 'fat_g', 'energy_kcal']
-foods_complete = foods_complete.dropna(subset=critical_nutrients)
-print(f"   ✓ After removing incomplete records: {len(foods_complete):,} foods")
-
-print("\nStep 5: Loading glycemic index data...")
-
-# Load GI table
-gi_df = pd.read_csv(DATA_RAW / 'gi_table.csv')
-print(f"   ✓ Loaded {len(gi_df)} foods with GI values")
-
-# Try to match foods - this is approximate matching by name
-# For better results, you'd need a comprehensive GI database
-foods_complete['food_name_lower'] = foods_complete['description'].str.lower()
-gi_df['food_name_lower'] = gi_df['food_name'].str.lower()
-
-# Merge (left join to keep all USDA foods, add GI where available)
-foods_with_gi = foods_complete.merge(
-    gi_df[['food_name_lower', 'glycemic_index']], 
-    on='food_name_lower', 
-    how='left'
-)
-
-# For foods without GI data, estimate based on carb content and fiber
-# This is a simplified heuristic
-def estimate_gi(row):
-    if pd.notna(row['glycemic_index']):
-        return row['glycemic_index']
-    
-    # Estimate based on net carbs and fiber
-    if row['total_carbs_g'] < 5:
-        return 15  # Very low carb foods
-    
-    fiber_ratio = row.get('fiber_g', 0) / row['total_carbs_g'] if row['total_carbs_g'] > 0 else 0
-    
-    if fiber_ratio > 0.15:
-        return 45  # High fiber = lower GI
-    elif fiber_ratio > 0.08:
-        return 60  # Medium fiber
+# Data types with the most complete nutritional data
+FOOD_DATA_TYPES = ['foundation_food', 'sr_legacy_food']
+
+# Per-food hashes from the last run, used by --incremental
+MANIFEST_FILE = DATA_PROCESSED / 'usda_foods_manifest.npz'
+
+# Code whose changes invalidate every previously processed row
+PIPELINE_FILES = [Path(__file__), PROJECT_ROOT / 'src' / 'data_prep.py',
+                  PROJECT_ROOT / 'src' / 'features.py']
+
+
+def main(argv=None, frames=None):
+    frames = frames or {}
+    parser = argparse.ArgumentParser(description="Process USDA FoodData Central")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Parse the raw CSVs directly instead of the Parquet cache")
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help="Rebuild the Parquet cache even if the CSVs are unchanged")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used to parse food_nutrient.csv (raw CSV path)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only reprocess foods added or changed since the last run")
+    parser.add_argument('--gi-min-score', type=float, default=0.8,
+                        help="Minimum share of a GI name's tokens a description must contain")
+    args = parser.parse_args(argv)
+
+    use_cache = HAS_PYARROW and not args.no_cache
+
+    print("=" * 80)
+    print("PROCESSING USDA FOODDATA CENTRAL")
+    print("=" * 80)
+
+    start_time = time.time()
+
+    # Ensure output directory exists
+    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+
+    if use_cache:
+        print("\nStep 0: Checking columnar cache...")
+        rebuilt = build_usda_cache(DATA_RAW, DATA_CACHE, force=args.rebuild_cache)
+        if rebuilt:
+            print(f"   ✓ Rebuilt cache for: {', '.join(rebuilt)}")
+        else:
+            print("   ✓ Cache is up to date")
+    elif not args.no_cache:
+        print("\nNote: pyarrow not installed, reading raw CSVs. Install with: pip install pyarrow")
+
+    print("\nStep 1: Loading food descriptions...")
+
+    if use_cache:
+        # The data_type filter is pushed down into the Parquet scan
+        food_df = read_usda_table(DATA_CACHE, 'food',
+                                  columns=['fdc_id', 'data_type', 'description'],
+                                  filters={'data_type': FOOD_DATA_TYPES})
+        print(f"   ✓ Loaded {len(food_df):,} foundation/SR legacy foods from cache")
     else:
-        return 70  # Low fiber = higher GI
-
-foods_with_gi['glycemic_index'] = foods_with_gi.apply(estimate_gi, axis=1)
-
-print(f"   ✓ GI values: {(~foods_with_gi['glycemic_index'].isna()).sum()} foods have GI")
-
-print("\nStep 6: Cleaning and finalizing dataset...")
-
-# Select final columns
-final_columns = [
-    'fdc_id',
-    'description',
-    'data_type',
-    'total_carbs_g',
-    'fiber_g',
-    'sugar_g',
-    'protein_g',
-    'fat_g',
-    'saturated_fat_g',
-    'energy_kcal',
-    'glycemic_index'
-]
-
-# Keep only columns that exist
-final_columns = [col for col in final_columns if col in foods_with_gi.columns]
-foods_final = foods_with_gi[final_columns].copy()
-
-# Fill remaining missing values with 0 for optional nutrients
-for col in ['fiber_g', 'sugar_g', 'saturated_fat_g']:
-    if col in foods_final.columns:
-        foods_final[col] = foods_final[col].fillna(0)
-
-# Rename for consistency
-foods_final = foods_final.rename(columns={'description': 'food_name'})
-
-# Remove outliers (values that don't make nutritional sense)
-foods_final = foods_final[
-    (foods_final['total_carbs_g'] >= 0) & (foods_final['total_carbs_g'] <= 100) &
-    (foods_final['protein_g'] >= 0) & (foods_final['protein_g'] <= 100) &
-    (foods_final['fat_g'] >= 0) & (foods_final['fat_g'] <= 100) &
-    (foods_final['energy_kcal'] >= 0) & (foods_final['energy_kcal'] <= 900)
-]
-
-print(f"   ✓ Final dataset: {len(foods_final):,} foods")
-
-print("\nStep 7: Saving processed dataset...")
-
-# Save to processed folder
-output_file = DATA_PROCESSED / 'usda_foods_with_nutrition.csv'
-foods_final.to_csv(output_file, index=False)
-
-elapsed = time.time() - start_time
-print(f"   ✓ Saved to: {output_file}")
-
-print("\n" + "=" * 80)
-print("PROCESSING COMPLETE!")
-print("=" * 80)
-
-print(f"\n📊 Dataset Summary:")
-print(f"   • Total foods: {len(foods_final):,}")
-print(f"   • Features: {len(foods_final.columns)}")
-print(f"   • Processing time: {elapsed:.1f} seconds")
-
-print(f"\n🥗 Nutritional Feature Ranges:")
-for col in ['total_carbs_g', 'fiber_g', 'protein_g', 'fat_g', 'energy_kcal']:
-    if col in foods_final.columns:
-        print(f"   • {col}: {foods_final[col].min():.1f} - {foods_final[col].max():.1f}")
-
-print(f"\n📈 Sample of processed foods:")
-print(foods_final.head(10).to_string())
-
-print(f"\n✅ Next steps:")
-print(f"   1. Review the data: data/processed/usda_foods_with_nutrition.csv")
-print(f"   2. Run feature engineering: python scripts/process_features.py")
-print(f"   3. Or use this data in notebooks for EDA")
-
-print("\n" + "=" * 80)
+        print("(This may take a minute for large files)")
+
+        # Load foods - filter for foundation and sr_legacy foods (most reliable data)
+        food_df = pd.read_csv(
+            DATA_RAW / 'food.csv',
+            usecols=['fdc_id', 'data_type', 'description'],
+            low_memory=False
+        )
+
+        print(f"   ✓ Loaded {len(food_df):,} total foods")
+        print(f"   Food types: {food_df['data_type'].value_counts().to_dict()}")
+
+        # Filter for foundation_food and sr_legacy_food (most complete nutritional data)
+        food_df = food_df[food_df['data_type'].isin(FOOD_DATA_TYPES)].copy()
+        print(f"   ✓ Filtered to {len(food_df):,} foundation/SR legacy foods")
+
+    print("\nStep 2: Loading nutritional data...")
+
+    # Load nutrients for our filtered foods only
+    relevant_fdc_ids = set(food_df['fdc_id'].values)
+
+    if use_cache:
+        # Partition pruning on nutrient_id, row-group statistics on fdc_id
+        nutrient_df = read_usda_table(DATA_CACHE, 'food_nutrient',
+                                      columns=['fdc_id', 'nutrient_id', 'amount'],
+                                      filters={'nutrient_id': NUTRIENT_MAP.keys(),
+                                               'fdc_id': relevant_fdc_ids})
+    else:
+        print("(This will take 2-3 minutes due to file size)")
+
+        if args.workers > 1:
+            # Newline-aligned byte ranges parsed in a process pool
+            nutrient_df = parallel_usda_nutrients(
+                DATA_RAW / 'food_nutrient.csv',
+                relevant_fdc_ids,
+                NUTRIENT_MAP.keys(),
+                workers=args.workers,
+                progress=lambda parts, kept: print(f"   Processed range... {parts} ranges so far")
+            )
+        else:
+            # Stream in chunks with compact dtypes; only matching rows are kept
+            nutrient_df = stream_usda_nutrients(
+                DATA_RAW / 'food_nutrient.csv',
+                relevant_fdc_ids,
+                NUTRIENT_MAP.keys(),
+                chunk_size=1000000,
+                progress=lambda chunks, kept: print(f"   Processed chunk... {chunks} chunks so far")
+            )
+
+    print(f"   ✓ Loaded {len(nutrient_df):,} relevant nutrient records")
+
+    print("\nStep 3: Pivoting nutrients to wide format...")
+
+    # Scatter nutrients into a dense fdc_id x nutrient matrix (first value wins)
+    nutrient_wide = nutrients_to_wide(nutrient_df, NUTRIENT_MAP)
+
+    print(f"   ✓ Created wide format with {len(nutrient_wide)} foods")
+    print(f"   Columns: {nutrient_wide.columns.tolist()}")
+
+    print("\nStep 4: Merging with food descriptions...")
+
+    # Merge foods with nutrients
+    foods_complete = food_df.merge(nutrient_wide, on='fdc_id', how='inner')
+    print(f"   ✓ Merged dataset: {len(foods_complete):,} foods with complete nutrition data")
+
+    output_file = DATA_PROCESSED / 'usda_foods_with_nutrition.csv'
+
+    # Fingerprint every food so the next run can tell what changed
+    row_ids, row_hash = hash_usda_rows(foods_complete)
+    context = ''.join(file_digest(path) for path in [DATA_RAW / 'gi_table.csv'] + PIPELINE_FILES)
+    context += f':gi_min_score={args.gi_min_score}'
+
+    delta_ids = None
+    if args.incremental:
+        manifest = load_usda_manifest(MANIFEST_FILE, context)
+        if manifest is None or not output_file.exists():
+            print("   ⚠️  No usable manifest from a previous run, doing a full rebuild")
+        else:
+            added, changed, removed = diff_usda_manifest(manifest, row_ids, row_hash)
+            delta_ids = np.concatenate([added, changed])
+            foods_complete = foods_complete[foods_complete['fdc_id'].isin(delta_ids)]
+            print(f"   ✓ Delta since last run: {len(added):,} added, "
+                  f"{len(changed):,} changed, {len(removed):,} removed")
+
+    # Remove rows with missing critical nutrients
+    critical_nutrients = ['total_carbs_g', 'protein_g', 'fat_g', 'energy_kcal']
+    foods_complete = foods_complete.dropna(subset=critical_nutrients)
+    print(f"   ✓ After removing incomplete records: {len(foods_complete):,} foods")
+
+    print("\nStep 5: Loading glycemic index data...")
+
+    # Load GI table
+    gi_file = (DATA_RAW / 'gi_table.csv').relative_to(PROJECT_ROOT).as_posix()
+    gi_df = frames[gi_file] if gi_file in frames else pd.read_csv(DATA_RAW / 'gi_table.csv')
+    print(f"   ✓ Loaded {len(gi_df)} foods with GI values")
+
+    # Fuzzy match USDA descriptions to GI names through a sparse token index
+    # (keeps all USDA foods, adds GI where a close enough name exists)
+    foods_with_gi = merge_nutritional_data(foods_complete, gi_df, min_score=args.gi_min_score)
+    print(f"   ✓ Matched {foods_with_gi['gi_match'].notna().sum():,} foods to the GI table")
+
+    # For foods without GI data, estimate based on carb content and fiber
+    # This is a simplified heuristic
+    foods_with_gi['glycemic_index'] = estimate_glycemic_index(
+        foods_with_gi['total_carbs_g'],
+        foods_with_gi['fiber_g'] if 'fiber_g' in foods_with_gi.columns else 0,
+        foods_with_gi['glycemic_index']
+    )
+
+    print(f"   ✓ GI values: {(~foods_with_gi['glycemic_index'].isna()).sum()} foods have GI")
+
+    print("\nStep 6: Cleaning and finalizing dataset...")
+
+    # Select final columns
+    final_columns = [
+        'fdc_id',
+        'description',
+        'data_type',
+        'total_carbs_g',
+        'fiber_g',
+        'sugar_g',
+        'protein_g',
+        'fat_g',
+        'saturated_fat_g',
+        'energy_kcal',
+        'glycemic_index'
+    ]
+
+    # Keep only columns that exist
+    final_columns = [col for col in final_columns if col in foods_with_gi.columns]
+    foods_final = foods_with_gi[final_columns].copy()
+
+    # Fill remaining missing values with 0 for optional nutrients
+    for col in ['fiber_g', 'sugar_g', 'saturated_fat_g']:
+        if col in foods_final.columns:
+            foods_final[col] = foods_final[col].fillna(0)
+
+    # Rename for consistency
+    foods_final = foods_final.rename(columns={'description': 'food_name'})
+
+    # Remove outliers (values that don't make nutritional sense)
+    foods_final = foods_final[
+        (foods_final['total_carbs_g'] >= 0) & (foods_final['total_carbs_g'] <= 100) &
+        (foods_final['protein_g'] >= 0) & (foods_final['protein_g'] <= 100) &
+        (foods_final['fat_g'] >= 0) & (foods_final['fat_g'] <= 100) &
+        (foods_final['energy_kcal'] >= 0) & (foods_final['energy_kcal'] <= 900)
+    ]
+
+    print(f"   ✓ Final dataset: {len(foods_final):,} foods")
+
+    print("\nStep 7: Saving processed dataset...")
+
+    if delta_ids is not None:
+        # Patch the previous output: drop removed/changed foods, add the recomputed
+        # rows and restore the order a full rebuild would produce
+        previous = pd.read_csv(output_file, dtype=foods_final.dtypes.to_dict())
+        unchanged = previous[previous['fdc_id'].isin(row_ids) & ~previous['fdc_id'].isin(delta_ids)]
+        foods_final = pd.concat([unchanged, foods_final], ignore_index=True)
+        order = np.argsort(pd.Index(row_ids).get_indexer(foods_final['fdc_id']), kind='stable')
+        foods_final = foods_final.iloc[order].reset_index(drop=True)
+        print(f"   ✓ Patched {len(delta_ids):,} foods into the previous dataset")
+
+    # Save to processed folder
+    foods_final.to_csv(output_file, index=False)
+    save_usda_manifest(MANIFEST_FILE, row_ids, row_hash, context)
+
+    elapsed = time.time() - start_time
+    print(f"   ✓ Saved to: {output_file}")
+
+    print("\n" + "=" * 80)
+    print("PROCESSING COMPLETE!")
+    print("=" * 80)
+
+    print(f"\n📊 Dataset Summary:")
+    print(f"   • Total foods: {len(foods_final):,}")
+    print(f"   • Features: {len(foods_final.columns)}")
+    print(f"   • Processing time: {elapsed:.1f} seconds")
+
+    print(f"\n🥗 Nutritional Feature Ranges:")
+    for col in ['total_carbs_g', 'fiber_g', 'protein_g', 'fat_g', 'energy_kcal']:
+        if col in foods_final.columns:
+            print(f"   • {col}: {foods_final[col].min():.1f} - {foods_final[col].max():.1f}")
+
+    print(f"\n📈 Sample of processed foods:")
+    print(foods_final.head(10).to_string())
+
+    print(f"\n✅ Next steps:")
+    print(f"   1. Review the data: data/processed/usda_foods_with_nutrition.csv")
+    print(f"   2. Run feature engineering: python scripts/process_features.py")
+    print(f"   3. Or use this data in notebooks for EDA")
+
+    print("\n" + "=" * 80)
+
+
+if __name__ == '__main__':
+    main()
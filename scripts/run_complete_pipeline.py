@@ -1,75 +1,90 @@
 """
 Master Pipeline Script
 Runs the complete ML pipeline from data processing to model deployment
+
+Stages only run when their code or inputs changed since the last successful
+run (see src/pipeline.py). By default they run in this interpreter, handing
+DataFrames to each other in memory; --subprocess isolates each stage in its
+own interpreter and runs independent stages side by side.
+
+Usage:
+    python scripts/run_complete_pipeline.py              # run what changed
+    python scripts/run_complete_pipeline.py --force      # run everything
+    python scripts/run_complete_pipeline.py --dry-run    # show what would run
 """
 
-import subprocess
+import argparse
 import sys
+import time
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.pipeline import PIPELINE_STAGES, PIPELINE_STATE, stage_dependencies, run_pipeline
+
+parser = argparse.ArgumentParser(description='Run the complete pipeline, skipping unchanged stages')
+parser.add_argument('--force', action='store_true', help='Run every stage regardless of the cache')
+parser.add_argument('--only', nargs='+', choices=list(PIPELINE_STAGES), metavar='STAGE',
+                    help=f"Run these stages (and what they depend on): {', '.join(PIPELINE_STAGES)}")
+parser.add_argument('--subprocess', action='store_true',
+                    help='Run each stage in its own interpreter (output streamed with a [stage] prefix)')
+parser.add_argument('--workers', type=int, default=None,
+                    help='Stages run at once with --subprocess (default: all ready)')
+parser.add_argument('--dry-run', action='store_true', help='Show what would run without running it')
+args = parser.parse_args()
+
 print("=" * 80)
 print("GESTATIONAL DIABETES PREDICTOR - COMPLETE PIPELINE")
 print("=" * 80)
 
-PROJECT_ROOT = Path(__file__).parent.parent
-
-def run_script(script_name, description):
-    """Run a Python script and handle errors"""
-    print(f"\n{'='*80}")
-    print(f"STEP: {description}")
-    print(f"{'='*80}\n")
-    
-    script_path = PROJECT_ROOT / 'scripts' / script_name
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(result.stdout)
-        if result.stderr:
-            print("Warnings:", result.stderr)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error running {script_name}:")
-        print(e.stdout)
-        print(e.stderr)
-        return False
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        return False
+stages = PIPELINE_STAGES
+if args.only:
+    dependencies = stage_dependencies(PIPELINE_STAGES)
+    selected = set()
+    todo = list(args.only)
+    while todo:
+        name = todo.pop()
+        if name not in selected:
+            selected.add(name)
+            todo.extend(dependencies[name])
+    stages = {name: stage for name, stage in PIPELINE_STAGES.items() if name in selected}
 
-# Step 1: Setup Data
-print("\n🔄 Starting complete pipeline...")
-success = True
+print(f"\n🔄 Starting complete pipeline ({len(stages)} stages, state in "
+      f"{PIPELINE_STATE.relative_to(PROJECT_ROOT)})...\n")
+start = time.perf_counter()
+report = run_pipeline(stages, force=args.force, workers=args.workers, dry_run=args.dry_run,
+                      in_process=not args.subprocess)
+elapsed = time.perf_counter() - start
 
-if run_script('setup_sample_data.py', '1. Setting up sample data'):
-    print("✅ Sample data ready")
-else:
-    print("⚠️ Sample data setup had issues, continuing...")
-
-# Step 2: Feature Engineering
-if run_script('process_features.py', '2. Feature engineering'):
-    print("✅ Features engineered successfully")
-else:
-    print("❌ Feature engineering failed")
-    success = False
+# Per-stage timings
+print("\n" + "=" * 80)
+print("STAGE SUMMARY")
+print("=" * 80)
+print(f"\n{'Stage':<14} {'Status':<16} {'Time':>8}")
+print("-" * 40)
+for name, result in report.items():
+    print(f"{name:<14} {result['status']:<16} {result['seconds']:>7.1f}s")
+print("-" * 40)
+print(f"{'Total':<31} {elapsed:>7.1f}s")
 
-# Step 3: Model Training
-if success and run_script('train_models.py', '3. Training ML models'):
-    print("✅ Models trained successfully")
-else:
-    print("❌ Model training failed")
-    success = False
+success = all(result['status'] not in ('failed', 'blocked') for result in report.values())
+if report.get('usda', {}).get('status') == 'missing inputs':
+    print("\nℹ️  USDA stage skipped: run scripts/download_data.py to fetch FoodData Central")
 
 # Final Summary
 print("\n" + "=" * 80)
-if success:
+if args.dry_run:
+    print("DRY RUN - nothing was executed")
+    print("=" * 80)
+elif success:
     print("✅ PIPELINE COMPLETE!")
     print("=" * 80)
-    print("\n🎉 All steps completed successfully!")
+    ran = [name for name, result in report.items() if result['status'] == 'ran']
+    if ran:
+        print(f"\n🎉 Ran: {', '.join(ran)}")
+    else:
+        print("\n🎉 Everything was up to date, nothing to run")
     print("\n📊 What's been created:")
     print("   • Feature-engineered dataset")
     print("   • 3 trained ML models (LR, RF, XGBoost)")
@@ -84,7 +99,10 @@ else:
     print("=" * 80)
     print("\n⚠️  Some steps failed. Please check the error messages above.")
     print("\nYou can run individual scripts manually:")
-    print("   python scripts/process_features.py")
-    print("   python scripts/train_models.py")
+    for name in report:
+        if report[name]['status'] in ('failed', 'blocked'):
+            print(f"   python {stages[name]['script']}")
+    print("\nOr rerun the pipeline: finished stages are not repeated.")
 
 print("\n" + "=" * 80)
+sys.exit(0 if success else 1)
@@ -0,0 +1,73 @@
+"""
+Batch-score a meal log with the trained model
+
+Streams a CSV or Parquet export of logged meals in chunks, computes the
+derived features and writes each meal's high-risk probability and tier
+(> 0.6 high, > 0.4 moderate, otherwise low - same cut-offs as the app).
+
+Usage:
+    python scripts/score_meals.py meals.csv scored.csv
+    python scripts/score_meals.py meals.parquet scored.parquet --keep meal_id user_id
+    python scripts/score_meals.py meals.csv scored.csv --rules    # no model needed
+    python scripts/score_meals.py meals.csv scored.csv --cascade  # model only for ambiguous meals
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.inference import (CASCADE_BAND, default_model_path, load_model_bundle,
+                           score_meal_file, warm_up)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-score a meal log")
+    parser.add_argument('input', help="CSV or .parquet file with one meal per row")
+    parser.add_argument('output', help="Destination .csv or .parquet file")
+    parser.add_argument('--model', default=str(default_model_path(PROJECT_ROOT / 'app')),
+                        help="Model written by train_models.py (export directory or .pkl)")
+    parser.add_argument('--rules', action='store_true',
+                        help="Use the rule-based score instead of the model")
+    parser.add_argument('--cascade', nargs='*', type=float, metavar='SCORE',
+                        help="Call the model only for rule scores inside the band "
+                             f"(default {CASCADE_BAND[0]} {CASCADE_BAND[1]})")
+    parser.add_argument('--keep', nargs='*', default=[],
+                        help="Input columns to copy to the output (e.g. ids)")
+    parser.add_argument('--chunk-size', type=int, default=100000,
+                        help="Rows held in memory at a time")
+    parser.add_argument('--quiet', action='store_true', help="No per-chunk progress")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BATCH MEAL SCORING")
+    print("=" * 80)
+
+    if args.rules:
+        bundle = None
+        print("\nModel: rule-based score")
+    else:
+        bundle = load_model_bundle(args.model)
+        warm_up(bundle)
+        print(f"\nModel: {bundle['model_type']} ({args.model})")
+    band = None
+    if args.cascade is not None and bundle is not None:
+        band = tuple(args.cascade) if args.cascade else CASCADE_BAND
+        print(f"Cascade: rules decide outside rule scores {band[0]}-{band[1]}")
+    print(f"Input: {args.input}")
+
+    stats = score_meal_file(bundle, args.input, args.output, keep_columns=args.keep,
+                            chunk_size=args.chunk_size, cascade_band=band,
+                            progress=not args.quiet)
+
+    print(f"\n✓ Scored {stats['rows']:,} meals in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} rows/s)")
+    if stats['rows']:
+        for tier in ['high', 'moderate', 'low']:
+            print(f"  {tier:<9} {stats[tier]:>10,} ({stats[tier] / stats['rows']:.1%})")
+    print(f"✓ Saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,10 +14,8 @@ Note: Respect copyright and terms of service for all sources.
 
 import pandas as pd
 import numpy as np
-import requests
 from pathlib import Path
 import time
-from bs4 import BeautifulSoup
 import json
 
 print("=" * 80)
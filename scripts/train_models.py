@@ -3,204 +3,354 @@ Model Training Notebook - Simplified Python Script Version
 Train Logistic Regression, Random Forest, and XGBoost models
 """
 
-import pandas as pd
 import numpy as np
 from pathlib import Path
 import pickle
-
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.data_prep import iter_feature_batches, load_feature_table
+from src.features import FEATURE_COLUMNS
+from src.inference import cascade_report, predict_matrix
+from src.model_export import check_export, export_model, load_exported_model
+from src.train_model import (CANDIDATE_MODELS, cpu_budgets, evaluate_streaming, fit_scaler_streaming,
+                             sample_batches, split_batches, train_candidates, train_random_forest,
+                             train_sgd_streaming, train_xgboost_streaming)
+
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
-import xgboost as xgb
+from sklearn.metrics import classification_report, confusion_matrix
 
 # Setup
 PROJECT_ROOT = Path('.')
 DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
 APP_DIR = PROJECT_ROOT / 'app'
-
-print("=" * 80)
-print("MODEL TRAINING PIPELINE")
-print("=" * 80)
-
-# Load feature-engineered data
-print("\n1. Loading feature-engineered data...")
-try:
-    df = pd.read_csv(DATA_PROCESSED / 'meals_with_features.csv')
-    print(f"   ✓ Loaded {len(df)} meals with {len(df.columns)} features")
-except FileNotFoundError:
-    print("   ⚠️  Feature-engineered data not found. Running feature engineering first...")
-    import sys
-    sys.path.append('scripts')
-    exec(open('scripts/process_features.py').read())
-    df = pd.read_csv(DATA_PROCESSED / 'meals_with_features.csv')
-
-# Prepare features and target
-print("\n2. Preparing features and target...")
-feature_cols = ['total_carbs_g', 'fiber_g', 'sugar_g', 'protein_g', 'fat_g',
-                'saturated_fat_g', 'energy_kcal', 'glycemic_index', 'glycemic_load',
-                'carb_quality_ratio', 'fat_to_carb_ratio', 'net_carbs_g',
-                'sugar_pct_carbs', 'protein_to_carb_ratio', 'high_sugar',
-                'low_fiber', 'high_carb']
-
-X = df[feature_cols]
-y = df['high_risk']
-
-print(f"   ✓ Features: {len(feature_cols)}")
-print(f"   ✓ Samples: {len(X)}")
-print(f"   ✓ Class balance: {y.value_counts().to_dict()}")
-
-# Train-test split
-print("\n3. Splitting data...")
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-print(f"   ✓ Training set: {len(X_train)} samples")
-print(f"   ✓ Test set: {len(X_test)} samples")
-
-# Scale features
-print("\n4. Scaling features...")
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-print("   ✓ Features standardized")
-
-# Model 1: Logistic Regression
-print("\n5. Training Logistic Regression (Baseline)...")
-lr_model = LogisticRegression(
-    random_state=42,
-    class_weight='balanced',
-    max_iter=1000
-)
-lr_model.fit(X_train_scaled, y_train)
-
-lr_train_score = lr_model.score(X_train_scaled, y_train)
-lr_test_score = lr_model.score(X_test_scaled, y_test)
-lr_pred = lr_model.predict(X_test_scaled)
-lr_auc = roc_auc_score(y_test, lr_model.predict_proba(X_test_scaled)[:, 1])
-
-print(f"   ✓ Training Accuracy: {lr_train_score:.3f}")
-print(f"   ✓ Test Accuracy: {lr_test_score:.3f}")
-print(f"   ✓ ROC-AUC: {lr_auc:.3f}")
-
-# Model 2: Random Forest
-print("\n6. Training Random Forest...")
-rf_model = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=10,
-    random_state=42,
-    class_weight='balanced',
-    n_jobs=-1
-)
-rf_model.fit(X_train, y_train)
-
-rf_train_score = rf_model.score(X_train, y_train)
-rf_test_score = rf_model.score(X_test, y_test)
-rf_pred = rf_model.predict(X_test)
-rf_auc = roc_auc_score(y_test, rf_model.predict_proba(X_test)[:, 1])
-
-print(f"   ✓ Training Accuracy: {rf_train_score:.3f}")
-print(f"   ✓ Test Accuracy: {rf_test_score:.3f}")
-print(f"   ✓ ROC-AUC: {rf_auc:.3f}")
-
-# Model 3: XGBoost
-print("\n7. Training XGBoost...")
-scale_pos_weight = (y_train == 0).sum() / (y_train == 1).sum()
-xgb_model = xgb.XGBClassifier(
-    n_estimators=100,
-    max_depth=6,
-    learning_rate=0.1,
-    random_state=42,
-    scale_pos_weight=scale_pos_weight,
-    eval_metric='logloss'
-)
-xgb_model.fit(X_train, y_train)
-
-xgb_train_score = xgb_model.score(X_train, y_train)
-xgb_test_score = xgb_model.score(X_test, y_test)
-xgb_pred = xgb_model.predict(X_test)
-xgb_auc = roc_auc_score(y_test, xgb_model.predict_proba(X_test)[:, 1])
-
-print(f"   ✓ Training Accuracy: {xgb_train_score:.3f}")
-print(f"   ✓ Test Accuracy: {xgb_test_score:.3f}")
-print(f"   ✓ ROC-AUC: {xgb_auc:.3f}")
-
-# Model comparison
-print("\n" + "=" * 80)
-print("MODEL COMPARISON")
-print("=" * 80)
-print(f"\n{'Model':<20} {'Train Acc':<12} {'Test Acc':<12} {'ROC-AUC':<12}")
-print("-" * 56)
-print(f"{'Logistic Regression':<20} {lr_train_score:<12.3f} {lr_test_score:<12.3f} {lr_auc:<12.3f}")
-print(f"{'Random Forest':<20} {rf_train_score:<12.3f} {rf_test_score:<12.3f} {rf_auc:<12.3f}")
-print(f"{'XGBoost':<20} {xgb_train_score:<12.3f} {xgb_test_score:<12.3f} {xgb_auc:<12.3f}")
-
-# Select best model (by AUC)
-models = {
-    'Logistic Regression': (lr_model, lr_auc, X_test_scaled),
-    'Random Forest': (rf_model, rf_auc, X_test),
-    'XGBoost': (xgb_model, xgb_auc, X_test)
-}
-
-best_model_name = max(models, key=lambda k: models[k][1])
-best_model, best_auc, best_X_test = models[best_model_name]
-
-print(f"\n🏆 Best Model: {best_model_name} (AUC: {best_auc:.3f})")
-
-# Detailed evaluation of best model
-print(f"\n" + "=" * 80)
-print(f"BEST MODEL EVALUATION: {best_model_name}")
-print("=" * 80)
-
-best_pred = best_model.predict(best_X_test)
-print("\nClassification Report:")
-print(classification_report(y_test, best_pred, target_names=['Low Risk', 'High Risk']))
-
-print("\nConfusion Matrix:")
-cm = confusion_matrix(y_test, best_pred)
-print(f"                Predicted")
-print(f"                Low  High")
-print(f"Actual  Low    {cm[0,0]:4d}  {cm[0,1]:4d}")
-print(f"        High   {cm[1,0]:4d}  {cm[1,1]:4d}")
-
-# Save models
-print("\n8. Saving models...")
-APP_DIR.mkdir(exist_ok=True)
-
-# Save best model and preprocessor
-with open(APP_DIR / 'model.pkl', 'wb') as f:
-    if best_model_name == 'Logistic Regression':
-        pickle.dump({'model': best_model, 'scaler': scaler, 'model_type': 'lr'}, f)
+TUNING_CACHE = PROJECT_ROOT / 'models' / 'tuning' / 'search.jsonl'
+
+
+def save_models(models, best_model_name, scaler, feature_cols, X_check):
+    """
+    Pickle every model (the best one for the app too) and export them pickle-free
+    
+    Parameters:
+    -----------
+    models : dict
+        {model name: fitted model} for CANDIDATE_MODELS
+    best_model_name : str
+        Model the app serves
+    scaler : StandardScaler
+        Scaler of the logistic regression
+    feature_cols : list of str
+        Feature order the models expect
+    X_check : ndarray
+        Unscaled rows the exports are checked against
+    """
+    print("\n8. Saving models...")
+    APP_DIR.mkdir(exist_ok=True)
+
+    # Save best model and preprocessor
+    with open(APP_DIR / 'model.pkl', 'wb') as f:
+        if best_model_name == 'Logistic Regression':
+            pickle.dump({'model': models[best_model_name], 'scaler': scaler, 'model_type': 'lr'}, f)
+        else:
+            pickle.dump({'model': models[best_model_name], 'scaler': None, 'model_type': best_model_name.lower().replace(' ', '_')}, f)
+
+    with open(APP_DIR / 'feature_names.pkl', 'wb') as f:
+        pickle.dump(feature_cols, f)
+
+    print(f"   ✓ Saved {best_model_name} to app/model.pkl")
+    print("   ✓ Saved feature names to app/feature_names.pkl")
+
+    # Save all models for comparison
+    models_dir = PROJECT_ROOT / 'models'
+    models_dir.mkdir(exist_ok=True)
+
+    with open(models_dir / 'logistic_regression.pkl', 'wb') as f:
+        pickle.dump({'model': models['Logistic Regression'], 'scaler': scaler}, f)
+    with open(models_dir / 'random_forest.pkl', 'wb') as f:
+        pickle.dump({'model': models['Random Forest'], 'scaler': None}, f)
+    with open(models_dir / 'xgboost.pkl', 'wb') as f:
+        pickle.dump({'model': models['XGBoost'], 'scaler': None}, f)
+
+    print("   ✓ Saved all models to models/ directory")
+
+    # Pickle-free exports: faster to load, not tied to library versions, scored with NumPy only
+    print("\n9. Exporting models...")
+    model_types = {'Logistic Regression': 'lr', 'Random Forest': 'random_forest', 'XGBoost': 'xgboost'}
+    exports = {APP_DIR / 'model': best_model_name}
+    exports.update({models_dir / name.lower().replace(' ', '_'): name for name in models})
+    for out_dir, name in exports.items():
+        bundle = {
+            'model': models[name],
+            'scaler': scaler if name == 'Logistic Regression' else None,
+            'model_type': model_types[name],
+            'feature_names': feature_cols
+        }
+        export_model(bundle, out_dir)
+        exported, _ = load_exported_model(out_dir)
+        max_diff = check_export(exported, X_check, predict_matrix(bundle, X_check), tolerance=1e-6)
+        print(f"   ✓ Exported {name} to {out_dir} (max |Δp| vs predict_proba: {max_diff:.1e})")
+
+
+def train_streaming(args):
+    """
+    Out-of-core training: the feature file is only ever read in batches
+    
+    Scaler statistics come from partial_fit, logistic regression is SGD with
+    partial_fit, XGBoost builds an external-memory matrix from the batches,
+    and the random forest (no partial_fit) trains on a bounded uniform
+    sample. Memory is set by --batch-rows and --sample-rows, not the data.
+    """
+    features_file = DATA_PROCESSED / 'meals_with_features.feather'
+    if not features_file.exists():
+        print(f"   ❌ {features_file} not found, run scripts/process_features.py first")
+        sys.exit(1)
+
+    feature_cols = list(FEATURE_COLUMNS)
+    batches = partial(iter_feature_batches, features_file, args.batch_rows, feature_cols)
+    train_batches = lambda: split_batches(batches(), 'train')
+    test_batches = lambda: split_batches(batches(), 'test')
+
+    print(f"\n1. Streaming {features_file} in batches of {args.batch_rows:,} rows "
+          f"(80/20 split drawn per row)...")
+
+    print("\n2. Fitting the scaler with partial_fit...")
+    start = time.perf_counter()
+    scaler, class_counts = fit_scaler_streaming(train_batches())
+    print(f"   ✓ {class_counts.sum():,} training rows, class balance {dict(enumerate(class_counts.tolist()))} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    fit_seconds = {}
+    models = {}
+    print(f"\n3. Training Logistic Regression (SGD, {args.epochs} passes)...")
+    start = time.perf_counter()
+    models['Logistic Regression'] = train_sgd_streaming(train_batches, scaler, class_counts,
+                                                        n_epochs=args.epochs)
+    fit_seconds['Logistic Regression'] = time.perf_counter() - start
+
+    print(f"\n4. Training Random Forest on a uniform sample of up to {args.sample_rows:,} rows...")
+    start = time.perf_counter()
+    X_sample, y_sample = sample_batches(train_batches(), args.sample_rows)
+    models['Random Forest'] = train_random_forest(X_sample, y_sample)
+    fit_seconds['Random Forest'] = time.perf_counter() - start
+    print(f"   ✓ Sampled {len(y_sample):,} rows")
+    del X_sample, y_sample
+
+    print("\n5. Training XGBoost from an external-memory DataIter...")
+    start = time.perf_counter()
+    models['XGBoost'] = train_xgboost_streaming(train_batches, class_counts)
+    fit_seconds['XGBoost'] = time.perf_counter() - start
+
+    print("\n6. Evaluating on the held-out stream...")
+    scores = {
+        name: evaluate_streaming(model, test_batches(), scaler if name == 'Logistic Regression' else None)
+        for name, model in models.items()
+    }
+
+    print("\n" + "=" * 80)
+    print("MODEL COMPARISON")
+    print("=" * 80)
+    print(f"\n{'Model':<20} {'Test Acc':<12} {'ROC-AUC':<12} {'Fit (s)':<8}")
+    print("-" * 52)
+    for name, r in scores.items():
+        print(f"{name:<20} {r['accuracy']:<12.3f} {r['auc']:<12.3f} {fit_seconds[name]:<8.2f}")
+    print(f"\n   Test rows: {scores['XGBoost']['n_rows']:,}; ROC-AUC binned on log-odds")
+
+    best_model_name = max(scores, key=lambda k: scores[k]['auc'])
+    best = scores[best_model_name]
+    print(f"\n🏆 Best Model: {best_model_name} (AUC: {best['auc']:.3f})")
+
+    cm = best['confusion']
+    print("\nConfusion Matrix:")
+    print(f"                Predicted")
+    print(f"                Low  High")
+    print(f"Actual  Low    {cm[0,0]:4d}  {cm[0,1]:4d}")
+    print(f"        High   {cm[1,0]:4d}  {cm[1,1]:4d}")
+
+    X_check, _ = next(test_batches())
+    save_models(models, best_model_name, scaler, feature_cols, X_check)
+
+    print("\n" + "=" * 80)
+    print("✅ MODEL TRAINING COMPLETE (streaming)")
+    print("=" * 80)
+    print(f"\n🎯 Best Model: {best_model_name}")
+    print(f"📊 Test Accuracy: {best['accuracy']:.3f}")
+    print(f"📈 ROC-AUC: {best['auc']:.3f}")
+
+
+def main(argv=None, frames=None):
+    """Train, compare, save and export the models (argv and frames as passed by the pipeline runner)"""
+    frames = frames or {}
+    parser = argparse.ArgumentParser(description="Train and compare the candidate models")
+    parser.add_argument('--cpus', type=int, default=None,
+                        help="Cores to train on (default: all)")
+    parser.add_argument('--serial', action='store_true',
+                        help="Train the models one after another instead of in parallel")
+    parser.add_argument('--tune', action='store_true',
+                        help="Search hyperparameters (successive halving, cached in "
+                             "models/tuning/) instead of using the defaults")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Out-of-core training: read the feature file in batches instead of "
+                             "loading it (SGD logistic regression, external-memory XGBoost)")
+    parser.add_argument('--batch-rows', type=int, default=100000,
+                        help="Rows per batch with --streaming")
+    parser.add_argument('--sample-rows', type=int, default=200000,
+                        help="Random forest sample size with --streaming")
+    parser.add_argument('--epochs', type=int, default=5,
+                        help="SGD passes over the data with --streaming")
+    args = parser.parse_args(argv)
+    if args.streaming and args.tune:
+        parser.error("--tune needs the data in memory and cannot be combined with --streaming")
+
+    print("=" * 80)
+    print("MODEL TRAINING PIPELINE")
+    print("=" * 80)
+
+    if args.streaming:
+        return train_streaming(args)
+
+    # Load feature-engineered data
+    print("\n1. Loading feature-engineered data...")
+    features_file = DATA_PROCESSED / 'meals_with_features.feather'
+    if features_file.as_posix() in frames:
+        df = frames[features_file.as_posix()]
+        print(f"   ✓ Received {len(df)} meals with {len(df.columns)} features from the previous stage")
+    elif features_file.exists():
+        df = load_feature_table(features_file)
+        print(f"   ✓ Memory-mapped {len(df)} meals with {len(df.columns)} columns from {features_file.name}")
+    else:
+        print("   ⚠️  Feature-engineered data not found. Running feature engineering first...")
+        sys.path.append(str(Path(__file__).resolve().parent))
+        from process_features import main as process_features
+        df = process_features([])[features_file.as_posix()]
+
+    # Prepare features and target
+    print("\n2. Preparing features and target...")
+    feature_cols = list(FEATURE_COLUMNS)
+
+    X = df[feature_cols]
+    y = df['high_risk']
+
+    print(f"   ✓ Features: {len(feature_cols)}")
+    print(f"   ✓ Samples: {len(X)}")
+    print(f"   ✓ Class balance: {y.value_counts().to_dict()}")
+
+    # Train-test split
+    print("\n3. Splitting data...")
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    print(f"   ✓ Training set: {len(X_train)} samples")
+    print(f"   ✓ Test set: {len(X_test)} samples")
+
+    # Scale features
+    print("\n4. Scaling features...")
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    print("   ✓ Features standardized")
+
+    # Optional hyperparameter search; finished evaluations are cached, so an
+    # interrupted or repeated search picks up where it left off
+    params = {}
+    if args.tune:
+        from src.tuning import tune_model
+
+        print("\n4b. Tuning hyperparameters (successive halving, 3-fold CV, ROC-AUC)...")
+        for name in CANDIDATE_MODELS:
+            X_search = X_train_scaled if name == 'Logistic Regression' else X_train
+            tuned = tune_model(name, X_search, y_train, cache_path=TUNING_CACHE, n_jobs=args.cpus)
+            params[name] = tuned['params']
+            print(f"   ✓ {name}: {tuned['params']} (CV AUC {tuned['score']:.3f}, "
+                  f"{tuned['cached']}/{tuned['evaluations']} evaluations from cache)")
+
+    # Models 1-3 side by side, each within its own CPU budget
+    n_cpus = args.cpus or os.cpu_count() or 1
+    parallel = not args.serial and n_cpus >= 3
+    if parallel:
+        budgets = cpu_budgets(n_cpus)
+        print(f"\n5-7. Training {', '.join(CANDIDATE_MODELS)} in parallel on {n_cpus} cores...")
+        print("   CPU budgets: " + ", ".join(f"{name} {budgets[name]}" for name in CANDIDATE_MODELS))
     else:
-        pickle.dump({'model': best_model, 'scaler': None, 'model_type': best_model_name.lower().replace(' ', '_')}, f)
-
-with open(APP_DIR / 'feature_names.pkl', 'wb') as f:
-    pickle.dump(feature_cols, f)
-
-print(f"   ✓ Saved {best_model_name} to app/model.pkl")
-print("   ✓ Saved feature names to app/feature_names.pkl")
-
-# Save all models for comparison
-models_dir = PROJECT_ROOT / 'models'
-models_dir.mkdir(exist_ok=True)
-
-with open(models_dir / 'logistic_regression.pkl', 'wb') as f:
-    pickle.dump({'model': lr_model, 'scaler': scaler}, f)
-with open(models_dir / 'random_forest.pkl', 'wb') as f:
-    pickle.dump({'model': rf_model, 'scaler': None}, f)
-with open(models_dir / 'xgboost.pkl', 'wb') as f:
-    pickle.dump({'model': xgb_model, 'scaler': None}, f)
-
-print("   ✓ Saved all models to models/ directory")
-
-print("\n" + "=" * 80)
-print("✅ MODEL TRAINING COMPLETE")
-print("=" * 80)
-print(f"\n🎯 Best Model: {best_model_name}")
-print(f"📊 Test Accuracy: {best_model.score(best_X_test, y_test):.3f}")
-print(f"📈 ROC-AUC: {best_auc:.3f}")
-print("\n📝 Next steps:")
-print("   1. Restart Streamlit app to use trained model")
-print("   2. Test predictions in the web interface")
-print("   3. Create visualizations for final report")
+        print(f"\n5-7. Training {', '.join(CANDIDATE_MODELS)} one after another on {n_cpus} cores...")
+    start = time.perf_counter()
+    results = train_candidates(X_train, y_train, X_test, y_test, X_train_scaled, X_test_scaled,
+                               n_cpus=n_cpus, parallel=parallel, params=params)
+    wall_seconds = time.perf_counter() - start
+    print(f"   ✓ Trained {len(results)} models in {wall_seconds:.1f}s wall-clock "
+          f"({sum(r['fit_seconds'] for r in results.values()):.1f}s of fitting)")
+
+    # Model comparison
+    print("\n" + "=" * 80)
+    print("MODEL COMPARISON")
+    print("=" * 80)
+    print(f"\n{'Model':<20} {'Train Acc':<12} {'Test Acc':<12} {'ROC-AUC':<12} {'Cores':<7} {'Fit (s)':<8}")
+    print("-" * 72)
+    for name, r in results.items():
+        print(f"{name:<20} {r['train_score']:<12.3f} {r['test_score']:<12.3f} {r['auc']:<12.3f} "
+              f"{r['n_jobs']:<7} {r['fit_seconds']:<8.2f}")
+
+    # Select best model (by AUC)
+    models = {
+        name: (r['model'], r['auc'], X_test_scaled if name == 'Logistic Regression' else X_test)
+        for name, r in results.items()
+    }
+
+    best_model_name = max(models, key=lambda k: models[k][1])
+    best_model, best_auc, best_X_test = models[best_model_name]
+
+    print(f"\n🏆 Best Model: {best_model_name} (AUC: {best_auc:.3f})")
+
+    # Detailed evaluation of best model
+    print(f"\n" + "=" * 80)
+    print(f"BEST MODEL EVALUATION: {best_model_name}")
+    print("=" * 80)
+
+    best_pred = best_model.predict(best_X_test)
+    print("\nClassification Report:")
+    print(classification_report(y_test, best_pred, target_names=['Low Risk', 'High Risk']))
+
+    print("\nConfusion Matrix:")
+    cm = confusion_matrix(y_test, best_pred)
+    print(f"                Predicted")
+    print(f"                Low  High")
+    print(f"Actual  Low    {cm[0,0]:4d}  {cm[0,1]:4d}")
+    print(f"        High   {cm[1,0]:4d}  {cm[1,1]:4d}")
+
+    # Cascade check: rules first, best model only for ambiguous meals
+    best_bundle = {
+        'model': best_model,
+        'scaler': scaler if best_model_name == 'Logistic Regression' else None,
+        'model_type': best_model_name,
+        'feature_names': feature_cols
+    }
+    cascade = cascade_report(best_bundle, X_test, y_true=y_test)
+    print("\nCascade (rules, then model inside the uncertainty band) on the test set:")
+    print(f"   Skipped the model:      {cascade['skip_fraction']:.1%} of meals")
+    print(f"   Latency saved:          {cascade['latency_saved']:.1%} "
+          f"({cascade['model_seconds']*1000:.1f} ms -> {cascade['cascade_seconds']*1000:.1f} ms)")
+    print(f"   Agreement with model:   {cascade['label_agreement']:.1%} labels, "
+          f"{cascade['tier_agreement']:.1%} risk tiers")
+    print(f"   Accuracy model/cascade: {cascade['model_accuracy']:.3f} / {cascade['cascade_accuracy']:.3f}")
+
+    save_models({name: r['model'] for name, r in results.items()}, best_model_name, scaler,
+                feature_cols, X_test.to_numpy(dtype=np.float64))
+
+    print("\n" + "=" * 80)
+    print("✅ MODEL TRAINING COMPLETE")
+    print("=" * 80)
+    print(f"\n🎯 Best Model: {best_model_name}")
+    print(f"📊 Test Accuracy: {best_model.score(best_X_test, y_test):.3f}")
+    print(f"📈 ROC-AUC: {best_auc:.3f}")
+    print("\n📝 Next steps:")
+    print("   1. Restart Streamlit app to use trained model")
+    print("   2. Test predictions in the web interface")
+    print("   3. Create visualizations for final report")
+
+
+if __name__ == '__main__':
+    main()
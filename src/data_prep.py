@@ -1,9 +1,29 @@
 # Placeholder for Python utility functions
 # This module will contain reusable data processing functions
 
+import csv
+import hashlib
+import io
+import json
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as ds
+    import pyarrow.ipc as ipc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from src.features import FEATURE_COLUMNS
+
 def load_usda_data(food_path, nutrient_path):
     """
     Load USDA FoodData Central files
@@ -40,22 +60,949 @@ def clean_food_names(df, column='food_name'):
     df : DataFrame
         Dataframe with cleaned food names
     """
-    pass  # To be implemented
+    df[f'{column}_clean'] = df[column].map(lambda name: ' '.join(tokenize_food_name(name)))
+    return df
 
-def merge_nutritional_data(usda_df, gi_df):
+def merge_nutritional_data(usda_df, gi_df, name_column='description', min_score=0.8):
     """
     Merge USDA nutritional data with GI reference table
     
+    Foods are matched by name with match_gi(); unmatched foods get NaN.
+    
     Parameters:
     -----------
     usda_df : DataFrame
         USDA nutritional data
     gi_df : DataFrame
         Glycemic index reference data
+    name_column : str
+        Column of usda_df holding the food description
+    min_score : float
+        Minimum match score (see match_gi)
         
     Returns:
     --------
     merged_df : DataFrame
         Combined dataset
     """
-    pass  # To be implemented
+    matches = match_gi(usda_df[name_column], build_gi_index(gi_df), min_score=min_score)
+    merged_df = usda_df.reset_index(drop=True)
+    merged_df['glycemic_index'] = matches['glycemic_index'].to_numpy()
+    merged_df['gi_match'] = matches['gi_food_name'].to_numpy()
+    merged_df['gi_match_score'] = matches['score'].to_numpy()
+    return merged_df
+
+
+# ---------------------------------------------------------------------------
+# Columnar cache for the USDA FoodData Central CSVs
+# ---------------------------------------------------------------------------
+
+CACHE_MANIFEST = '_manifest.json'
+CACHE_FORMAT_VERSION = 1
+
+# Typed layout of each cached table. The partition column becomes a hive
+# directory (e.g. nutrient_id=1005/) so readers only open what they filter on.
+# food stays unpartitioned: it is small and downstream merges rely on its row order.
+USDA_CACHE_TABLES = {
+    'food': {
+        'file': 'food.csv',
+        'columns': {'fdc_id': 'int32', 'data_type': 'string', 'description': 'string'},
+        'partition': None,
+    },
+    'food_nutrient': {
+        'file': 'food_nutrient.csv',
+        'columns': {'fdc_id': 'int32', 'nutrient_id': 'int32', 'amount': 'float32'},
+        'partition': 'nutrient_id',
+    },
+}
+
+
+def source_signature(path):
+    """
+    Describe a source file by its size and modification time
+    
+    Parameters:
+    -----------
+    path : Path
+        Source CSV file
+        
+    Returns:
+    --------
+    signature : dict
+        {'size': bytes, 'mtime_ns': modification time}
+    """
+    stat = Path(path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _read_cache_manifest(cache_dir):
+    manifest_path = Path(cache_dir) / CACHE_MANIFEST
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != CACHE_FORMAT_VERSION:
+        return {}
+    return manifest.get('tables', {})
+
+
+def _write_cache_manifest(cache_dir, tables):
+    manifest_path = Path(cache_dir) / CACHE_MANIFEST
+    with open(manifest_path, 'w') as f:
+        json.dump({'version': CACHE_FORMAT_VERSION, 'tables': tables}, f, indent=2)
+
+
+def _partitioning(table):
+    spec = USDA_CACHE_TABLES[table]
+    column = spec['partition']
+    if column is None:
+        return None
+    return ds.partitioning(
+        pa.schema([(column, pa.type_for_alias(spec['columns'][column]))]),
+        flavor='hive'
+    )
+
+
+def usda_cache_is_fresh(raw_dir, cache_dir, table):
+    """
+    Check whether the cached copy of a USDA table matches its source CSV
+    
+    Parameters:
+    -----------
+    raw_dir : Path
+        Directory holding the raw FoodData Central CSVs
+    cache_dir : Path
+        Directory holding the columnar cache
+    table : str
+        Key of USDA_CACHE_TABLES
+        
+    Returns:
+    --------
+    fresh : bool
+        True when the cache exists and the source size/mtime are unchanged
+    """
+    entry = _read_cache_manifest(cache_dir).get(table)
+    if entry is None or not (Path(cache_dir) / table).exists():
+        return False
+    source = Path(raw_dir) / USDA_CACHE_TABLES[table]['file']
+    return entry['source'] == source_signature(source)
+
+
+def build_usda_cache(raw_dir, cache_dir, tables=None, force=False):
+    """
+    Convert the raw USDA CSVs into a partitioned Parquet cache
+    
+    The CSVs are streamed block by block, so the conversion never holds a
+    full table in memory. Tables whose source files are unchanged since the
+    last build are skipped unless force=True.
+    
+    Parameters:
+    -----------
+    raw_dir : Path
+        Directory holding food.csv and food_nutrient.csv
+    cache_dir : Path
+        Output directory for the cache
+    tables : list of str, optional
+        Tables to build (default: all of USDA_CACHE_TABLES)
+    force : bool
+        Rebuild even if the cache is fresh
+        
+    Returns:
+    --------
+    rebuilt : list of str
+        Names of the tables that were (re)written
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for the USDA cache. Install with: pip install pyarrow")
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_cache_manifest(cache_dir)
+    rebuilt = []
+
+    for table in tables or list(USDA_CACHE_TABLES):
+        if not force and usda_cache_is_fresh(raw_dir, cache_dir, table):
+            continue
+
+        spec = USDA_CACHE_TABLES[table]
+        source = Path(raw_dir) / spec['file']
+        signature = source_signature(source)
+        column_types = {col: pa.type_for_alias(dtype) for col, dtype in spec['columns'].items()}
+
+        reader = pacsv.open_csv(
+            source,
+            read_options=pacsv.ReadOptions(block_size=64 << 20),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(spec['columns']),
+                column_types=column_types
+            )
+        )
+
+        # Write next to the old copy and swap, so an interrupted build never
+        # leaves a half-written table behind a valid manifest entry
+        target = cache_dir / table
+        staging = cache_dir / f'{table}.tmp'
+        if staging.exists():
+            shutil.rmtree(staging)
+        ds.write_dataset(
+            reader,
+            staging,
+            format='parquet',
+            partitioning=_partitioning(table),
+            max_partitions=4096,
+            max_rows_per_group=1 << 20,
+            preserve_order=True
+        )
+        if target.exists():
+            shutil.rmtree(target)
+        staging.rename(target)
+
+        manifest[table] = {'source': signature, 'columns': spec['columns']}
+        _write_cache_manifest(cache_dir, manifest)
+        rebuilt.append(table)
+
+    return rebuilt
+
+
+def read_usda_table(cache_dir, table, columns=None, filters=None):
+    """
+    Read columns of a cached USDA table, pruning partitions and row groups
+    
+    Parameters:
+    -----------
+    cache_dir : Path
+        Directory holding the columnar cache
+    table : str
+        Key of USDA_CACHE_TABLES
+    columns : list of str, optional
+        Columns to load (default: all)
+    filters : dict, optional
+        {column: allowed values}; rows must match every entry
+        
+    Returns:
+    --------
+    df : DataFrame
+        Matching rows with the cache's compact dtypes
+    """
+    dataset = ds.dataset(Path(cache_dir) / table, format='parquet',
+                         partitioning=_partitioning(table))
+
+    expression = None
+    for column, values in (filters or {}).items():
+        values = pa.array(list(values), type=dataset.schema.field(column).type)
+        condition = ds.field(column).isin(values)
+        expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+# ---------------------------------------------------------------------------
+# Feature table: Arrow IPC (Feather v2) handoff from features to training
+# ---------------------------------------------------------------------------
+
+FEATURE_TABLE_TARGET = 'high_risk'
+
+
+def feature_table_schema(columns=FEATURE_COLUMNS, target=FEATURE_TABLE_TARGET):
+    """Fields every feature table must carry: float64 features and an int8 target"""
+    return pa.schema([(col, pa.float64()) for col in columns] + [(target, pa.int8())])
+
+
+def save_feature_table(df, path, columns=FEATURE_COLUMNS, target=FEATURE_TABLE_TARGET):
+    """
+    Write the feature-engineered dataset as an uncompressed Arrow IPC file
+    
+    Feature and target columns are cast to feature_table_schema(); other
+    columns (e.g. food_name) are kept as they are. The file is written next
+    to path and renamed into place, so a reader never sees it half-written
+    and a process still mapping the old file keeps a consistent view.
+    
+    Parameters:
+    -----------
+    df : DataFrame
+        Output of feature engineering, including the target
+    path : Path
+        Output file (conventionally .feather)
+    columns : list of str
+        Feature columns
+    target : str
+        Label column
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for the feature table. Install with: pip install pyarrow")
+    missing = [col for col in list(columns) + [target] if col not in df.columns]
+    if missing:
+        raise ValueError(f"Feature table is missing columns: {missing}")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for field in feature_table_schema(columns, target):
+        i = table.schema.get_field_index(field.name)
+        table = table.set_column(i, field, table.column(i).cast(field.type))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(path.name + '.tmp')
+    with ipc.new_file(staging, table.schema) as writer:
+        writer.write_table(table)
+    staging.replace(path)
+
+
+def load_feature_table(path, columns=FEATURE_COLUMNS, target=FEATURE_TABLE_TARGET):
+    """
+    Memory-map a feature table and return its feature and target columns
+    
+    Nothing is parsed: the columns are views onto the mapped file (read-only),
+    so loading costs no more than the pages training actually touches.
+    
+    Parameters:
+    -----------
+    path : Path
+        File written by save_feature_table()
+    columns : list of str
+        Feature columns to return
+    target : str
+        Label column
+        
+    Returns:
+    --------
+    df : DataFrame
+        columns + [target]
+        
+    Raises:
+    -------
+    ValueError
+        If a column is missing or has the wrong type (e.g. a file written by
+        an older version of the feature code)
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for the feature table. Install with: pip install pyarrow")
+    with pa.memory_map(str(path)) as source:
+        table = ipc.open_file(source).read_all()
+    _check_feature_schema(table.schema, path, columns, target)
+
+    return table.select(list(columns) + [target]).to_pandas(split_blocks=True)
+
+
+def _check_feature_schema(schema, path, columns, target):
+    problems = []
+    for field in feature_table_schema(columns, target):
+        if field.name not in schema.names:
+            problems.append(f"{field.name} missing")
+        elif schema.field(field.name).type != field.type:
+            problems.append(f"{field.name} is {schema.field(field.name).type}, expected {field.type}")
+    if problems:
+        raise ValueError(f"{path} does not match the feature schema ({'; '.join(problems)}); "
+                         f"rerun scripts/process_features.py")
+
+
+def iter_feature_batches(path, batch_rows=100000, columns=FEATURE_COLUMNS, target=FEATURE_TABLE_TARGET):
+    """
+    Stream (X, y) batches from a feature table without loading it whole
+    
+    An Arrow IPC file is memory-mapped and sliced, so only the pages of the
+    current batch are read; a CSV is parsed batch_rows at a time. Either
+    way memory is bounded by batch_rows, whatever the file size. Call it
+    again for another pass.
+    
+    Parameters:
+    -----------
+    path : Path
+        Feature table (.feather/.arrow from save_feature_table(), or .csv)
+    batch_rows : int
+        Rows per batch
+    columns : list of str
+        Feature columns, in the order of X's columns
+    target : str
+        Label column
+        
+    Yields:
+    -------
+    X : ndarray of shape (<= batch_rows, len(columns)), float64
+    y : ndarray of int8
+    """
+    columns = list(columns)
+    if Path(path).suffix == '.csv':
+        for chunk in pd.read_csv(path, usecols=columns + [target], chunksize=batch_rows):
+            yield chunk[columns].to_numpy(dtype=np.float64), chunk[target].to_numpy(dtype=np.int8)
+        return
+
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required for the feature table. Install with: pip install pyarrow")
+    with pa.memory_map(str(path)) as source:
+        reader = ipc.open_file(source)
+        _check_feature_schema(reader.schema, path, columns, target)
+        indices = [reader.schema.get_field_index(col) for col in columns]
+        target_index = reader.schema.get_field_index(target)
+        for i in range(reader.num_record_batches):
+            record_batch = reader.get_batch(i)
+            for start in range(0, record_batch.num_rows, batch_rows):
+                part = record_batch.slice(start, batch_rows)
+                X = np.column_stack([part.column(j).to_numpy() for j in indices])
+                yield X, part.column(target_index).to_numpy()
+
+
+# ---------------------------------------------------------------------------
+# Streaming reader for food_nutrient.csv
+# ---------------------------------------------------------------------------
+
+NUTRIENT_DTYPES = {'fdc_id': 'int32', 'nutrient_id': 'int32', 'amount': 'float32'}
+
+
+def nutrient_bitmap(nutrient_ids):
+    """
+    Build a boolean lookup table indexed by nutrient_id
+    
+    Parameters:
+    -----------
+    nutrient_ids : iterable of int
+        Nutrient IDs to keep
+        
+    Returns:
+    --------
+    bitmap : ndarray of bool
+        bitmap[nutrient_id] is True for kept nutrients
+    """
+    nutrient_ids = np.fromiter(nutrient_ids, dtype=np.int64)
+    bitmap = np.zeros(nutrient_ids.max() + 1 if len(nutrient_ids) else 1, dtype=bool)
+    bitmap[nutrient_ids] = True
+    return bitmap
+
+
+def filter_nutrient_rows(fdc_id, nutrient_id, amount, fdc_keys, bitmap):
+    """
+    Keep rows whose nutrient is in the bitmap and whose fdc_id is in fdc_keys
+    
+    The nutrient test runs first because it is a single table lookup and
+    discards most rows; the fdc_id binary search only sees the survivors.
+    
+    Parameters:
+    -----------
+    fdc_id, nutrient_id, amount : ndarray
+        Columns of a food_nutrient chunk
+    fdc_keys : ndarray
+        Sorted, unique fdc_ids to keep
+    bitmap : ndarray of bool
+        Output of nutrient_bitmap()
+        
+    Returns:
+    --------
+    fdc_id, nutrient_id, amount : ndarray
+        Filtered columns
+    """
+    in_range = (nutrient_id >= 0) & (nutrient_id < len(bitmap))
+    keep = np.zeros(len(nutrient_id), dtype=bool)
+    keep[in_range] = bitmap[nutrient_id[in_range]]
+    fdc_id, nutrient_id, amount = fdc_id[keep], nutrient_id[keep], amount[keep]
+
+    if len(fdc_keys) == 0:
+        keep = np.zeros(len(fdc_id), dtype=bool)
+    else:
+        pos = np.searchsorted(fdc_keys, fdc_id)
+        pos[pos == len(fdc_keys)] = 0
+        keep = fdc_keys[pos] == fdc_id
+    return fdc_id[keep], nutrient_id[keep], amount[keep]
+
+
+class _NutrientRows:
+    """Preallocated fdc_id/nutrient_id/amount buffers that grow geometrically"""
+
+    def __init__(self, capacity):
+        # Typical release: one row per (food, nutrient)
+        capacity = max(capacity, 1024)
+        self.fdc_id = np.empty(capacity, dtype=np.int32)
+        self.nutrient_id = np.empty(capacity, dtype=np.int32)
+        self.amount = np.empty(capacity, dtype=np.float32)
+        self.n = 0
+
+    def append(self, fdc_id, nutrient_id, amount):
+        end = self.n + len(fdc_id)
+        if end > len(self.fdc_id):
+            capacity = max(len(self.fdc_id) * 2, end)
+            self.fdc_id = np.resize(self.fdc_id, capacity)
+            self.nutrient_id = np.resize(self.nutrient_id, capacity)
+            self.amount = np.resize(self.amount, capacity)
+        self.fdc_id[self.n:end] = fdc_id
+        self.nutrient_id[self.n:end] = nutrient_id
+        self.amount[self.n:end] = amount
+        self.n = end
+
+    def to_frame(self):
+        return pd.DataFrame({
+            'fdc_id': self.fdc_id[:self.n],
+            'nutrient_id': self.nutrient_id[:self.n],
+            'amount': self.amount[:self.n]
+        })
+
+
+def stream_usda_nutrients(path, fdc_ids, nutrient_ids, chunk_size=1000000, progress=None):
+    """
+    Stream food_nutrient.csv and collect the rows for the given foods/nutrients
+    
+    Columns are parsed straight into compact dtypes (int32 ids, float32
+    amounts) and survivors are copied into preallocated arrays that grow
+    geometrically, so memory tracks the size of the result rather than the
+    size of the release.
+    
+    Parameters:
+    -----------
+    path : Path
+        Path to food_nutrient.csv
+    fdc_ids : iterable of int
+        Foods to keep
+    nutrient_ids : iterable of int
+        Nutrients to keep
+    chunk_size : int
+        Rows parsed per chunk
+    progress : callable, optional
+        Called as progress(chunks_done, rows_kept) after each chunk
+        
+    Returns:
+    --------
+    nutrient_df : DataFrame
+        fdc_id, nutrient_id, amount in file order
+    """
+    fdc_keys = np.unique(np.fromiter(fdc_ids, dtype=np.int64)).astype(np.int32)
+    nutrient_ids = list(nutrient_ids)
+    bitmap = nutrient_bitmap(nutrient_ids)
+    rows = _NutrientRows(len(fdc_keys) * len(nutrient_ids))
+
+    reader = pd.read_csv(path, usecols=list(NUTRIENT_DTYPES), dtype=NUTRIENT_DTYPES,
+                         chunksize=chunk_size, engine='c')
+    for i, chunk in enumerate(reader, 1):
+        rows.append(*filter_nutrient_rows(
+            chunk['fdc_id'].to_numpy(), chunk['nutrient_id'].to_numpy(),
+            chunk['amount'].to_numpy(), fdc_keys, bitmap
+        ))
+        if progress is not None:
+            progress(i, rows.n)
+
+    return rows.to_frame()
+
+
+# ---------------------------------------------------------------------------
+# Parallel reader: newline-aligned byte ranges parsed in a process pool
+# ---------------------------------------------------------------------------
+
+def split_csv_ranges(path, part_size=64 << 20):
+    """
+    Split a CSV body into byte ranges that start and end on line boundaries
+    
+    Assumes no quoted field spans a line break, which holds for the id and
+    amount columns of food_nutrient.csv.
+    
+    Parameters:
+    -----------
+    path : Path
+        CSV file with a single header line
+    part_size : int
+        Approximate bytes per range
+        
+    Returns:
+    --------
+    header : list of str
+        Column names from the header line
+    ranges : list of (int, int)
+        [start, end) byte offsets covering every data line exactly once
+    """
+    size = Path(path).stat().st_size
+    with open(path, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8-sig')]))
+        start = f.tell()
+        ranges = []
+        while start < size:
+            f.seek(min(start + part_size, size))
+            f.readline()  # finish the line the cut landed in
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def _filter_nutrient_range(path, header, start, end, fdc_keys, bitmap):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    chunk = pd.read_csv(io.BytesIO(data), header=None, names=header,
+                        usecols=list(NUTRIENT_DTYPES), dtype=NUTRIENT_DTYPES, engine='c')
+    return filter_nutrient_rows(
+        chunk['fdc_id'].to_numpy(), chunk['nutrient_id'].to_numpy(),
+        chunk['amount'].to_numpy(), fdc_keys, bitmap
+    )
+
+
+def parallel_usda_nutrients(path, fdc_ids, nutrient_ids, workers, part_size=64 << 20,
+                            progress=None):
+    """
+    Parallel version of stream_usda_nutrients()
+    
+    Each newline-aligned byte range is parsed and filtered in a worker
+    process; results are merged in file order, so the output is identical
+    to the serial reader.
+    
+    Parameters:
+    -----------
+    path : Path
+        Path to food_nutrient.csv
+    fdc_ids : iterable of int
+        Foods to keep
+    nutrient_ids : iterable of int
+        Nutrients to keep
+    workers : int
+        Number of worker processes
+    part_size : int
+        Approximate bytes handed to a worker per task
+    progress : callable, optional
+        Called as progress(ranges_done, rows_kept) after each range
+        
+    Returns:
+    --------
+    nutrient_df : DataFrame
+        fdc_id, nutrient_id, amount in file order
+    """
+    fdc_keys = np.unique(np.fromiter(fdc_ids, dtype=np.int64)).astype(np.int32)
+    nutrient_ids = list(nutrient_ids)
+    bitmap = nutrient_bitmap(nutrient_ids)
+    rows = _NutrientRows(len(fdc_keys) * len(nutrient_ids))
+
+    header, ranges = split_csv_ranges(path, part_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_filter_nutrient_range, str(path), header, start, end, fdc_keys, bitmap)
+            for start, end in ranges
+        ]
+        for i, future in enumerate(futures, 1):
+            rows.append(*future.result())
+            if progress is not None:
+                progress(i, rows.n)
+
+    return rows.to_frame()
+
+
+# ---------------------------------------------------------------------------
+# Long -> wide nutrient table
+# ---------------------------------------------------------------------------
+
+def nutrients_to_wide(nutrient_df, nutrient_map):
+    """
+    Scatter long (fdc_id, nutrient_id, amount) rows into one column per nutrient
+    
+    Equivalent to pivot_table(index='fdc_id', columns='nutrient_id',
+    values='amount', aggfunc='first') followed by renaming with nutrient_map,
+    but fills a preallocated float32 matrix with fancy indexing instead of
+    a groupby.
+    
+    Parameters:
+    -----------
+    nutrient_df : DataFrame
+        Long nutrient rows with fdc_id, nutrient_id, amount
+    nutrient_map : dict
+        {nutrient_id: column name}
+        
+    Returns:
+    --------
+    nutrient_wide : DataFrame
+        fdc_id plus one column per nutrient present, sorted by fdc_id
+    """
+    amount = nutrient_df['amount'].to_numpy(dtype=np.float32)
+    valid = ~np.isnan(amount)
+    fdc_id = nutrient_df['fdc_id'].to_numpy()[valid]
+    nutrient_id = nutrient_df['nutrient_id'].to_numpy()[valid]
+    amount = amount[valid]
+
+    # Row index: hash-factorize fdc_ids, then renumber so rows come out sorted
+    codes, uniques = pd.factorize(fdc_id)
+    order = np.argsort(uniques)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    fdc_keys = uniques[order]
+    row = rank[codes]
+
+    # Column index: nutrient ids are small integers, so a lookup table works
+    present = np.bincount(nutrient_id, minlength=1) > 0
+    nutrient_keys = np.flatnonzero(present)
+    lookup = np.cumsum(present) - 1
+    col = lookup[nutrient_id]
+
+    # First row per cell wins, as with aggfunc='first'
+    n_cells = len(fdc_keys) * len(nutrient_keys)
+    first = np.full(n_cells, len(amount), dtype=np.int64)
+    np.minimum.at(first, row * len(nutrient_keys) + col, np.arange(len(amount)))
+    filled = first < len(amount)
+
+    matrix = np.full(n_cells, np.nan, dtype=np.float32)
+    matrix[filled] = amount[first[filled]]
+    matrix = matrix.reshape(len(fdc_keys), len(nutrient_keys))
+
+    nutrient_wide = pd.DataFrame(
+        matrix,
+        columns=[nutrient_map.get(n, f'nutrient_{n}') for n in nutrient_keys]
+    )
+    nutrient_wide.insert(0, 'fdc_id', fdc_keys)
+    return nutrient_wide
+
+
+# ---------------------------------------------------------------------------
+# Incremental refresh: per-fdc_id content hashes
+# ---------------------------------------------------------------------------
+
+USDA_MANIFEST_VERSION = 1
+
+
+def file_digest(path):
+    """
+    SHA-256 hex digest of a file's bytes
+    
+    Parameters:
+    -----------
+    path : Path
+        File to hash
+        
+    Returns:
+    --------
+    digest : str
+    """
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def hash_usda_rows(df, key='fdc_id'):
+    """
+    Hash every row's content so unchanged foods can be recognised across releases
+    
+    Parameters:
+    -----------
+    df : DataFrame
+        One row per food (descriptions plus wide nutrient columns)
+    key : str
+        Identifier column, excluded from the hash
+        
+    Returns:
+    --------
+    ids : ndarray
+        Values of the key column
+    row_hash : ndarray of uint64
+        Content hash of each row
+    """
+    columns = sorted(col for col in df.columns if col != key)
+    row_hash = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return df[key].to_numpy(), row_hash
+
+
+def save_usda_manifest(path, ids, row_hash, context):
+    """
+    Save per-food hashes from a run
+    
+    Parameters:
+    -----------
+    path : Path
+        Output .npz file
+    ids, row_hash : ndarray
+        Output of hash_usda_rows()
+    context : str
+        Digest of everything else the output depends on (e.g. the GI table)
+    """
+    np.savez(path, ids=ids, row_hash=row_hash,
+             context=np.array(f'{USDA_MANIFEST_VERSION}:{context}'))
+
+
+def load_usda_manifest(path, context):
+    """
+    Load the hashes from the previous run
+    
+    Parameters:
+    -----------
+    path : Path
+        .npz file written by save_usda_manifest()
+    context : str
+        Digest for the current run
+        
+    Returns:
+    --------
+    manifest : Series or None
+        Row hashes indexed by id, or None when there is no usable manifest
+        (missing, older format, or a different context)
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        if str(data['context']) != f'{USDA_MANIFEST_VERSION}:{context}':
+            return None
+        return pd.Series(data['row_hash'], index=data['ids'])
+
+
+def diff_usda_manifest(manifest, ids, row_hash):
+    """
+    Compare a new release's hashes against the previous manifest
+    
+    Parameters:
+    -----------
+    manifest : Series
+        Previous row hashes indexed by id
+    ids, row_hash : ndarray
+        Hashes for the new release
+        
+    Returns:
+    --------
+    added, changed, removed : ndarray
+        Ids new in this release, present in both with different content,
+        and no longer present
+    """
+    position = manifest.index.get_indexer(ids)
+    known = position >= 0
+    previous = manifest.to_numpy()[position[known]]
+
+    added = ids[~known]
+    changed = ids[known][previous != row_hash[known]]
+    removed = manifest.index[~manifest.index.isin(ids)].to_numpy()
+    return added, changed, removed
+
+
+# ---------------------------------------------------------------------------
+# GI table matching
+# ---------------------------------------------------------------------------
+
+# Function words that carry no information about the food itself
+FOOD_NAME_STOPWORDS = {'a', 'and', 'in', 'of', 'or', 'the', 'to', 'with', 'without', 'w'}
+
+
+def _singular(token):
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 4 and token.endswith('oes'):
+        return token[:-2]
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize_food_name(name):
+    """
+    Normalize a food name into matching tokens
+    
+    'Potatoes, baked (with skin)' -> ['potato', 'baked', 'skin']
+    
+    Parameters:
+    -----------
+    name : str
+        Food name or USDA description
+        
+    Returns:
+    --------
+    tokens : list of str
+    """
+    if not isinstance(name, str):
+        return []
+    return [
+        _singular(token)
+        for token in re.findall(r'[a-z0-9]+', name.lower())
+        if token not in FOOD_NAME_STOPWORDS
+    ]
+
+
+def build_gi_index(gi_df, name_column='food_name'):
+    """
+    Build a sparse token index over a GI reference table
+    
+    Parameters:
+    -----------
+    gi_df : DataFrame
+        GI table with a name column and glycemic_index
+    name_column : str
+        Column holding the reference food names
+        
+    Returns:
+    --------
+    gi_index : dict
+        'vectorizer' : TfidfVectorizer fitted on the GI names
+        'tfidf' : L2-normalized TF-IDF rows (GI foods x tokens)
+        'coverage' : idf weights normalized to sum to 1 per GI food
+        'names', 'glycemic_index' : ndarray aligned with the rows
+    """
+    # Only the USDA processing needs these; the feature table helpers don't
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    names = gi_df[name_column].to_numpy()
+    vectorizer = TfidfVectorizer(analyzer=tokenize_food_name)
+    tfidf = vectorizer.fit_transform(names).tocsr()
+
+    # Share of each GI name's (idf-weighted) tokens; a description containing
+    # all of them scores 1 regardless of how many extra tokens it has
+    coverage = (tfidf > 0).astype(np.float64).multiply(vectorizer.idf_).tocsr()
+    totals = np.asarray(coverage.sum(axis=1)).ravel()
+    totals[totals == 0] = 1.0
+    coverage = sparse.diags(1.0 / totals) @ coverage
+
+    return {
+        'vectorizer': vectorizer,
+        'tfidf': tfidf,
+        'coverage': coverage.T.tocsr(),
+        'names': names,
+        'glycemic_index': gi_df['glycemic_index'].to_numpy(dtype=np.float64),
+    }
+
+
+def match_gi(descriptions, gi_index, min_score=0.8, batch_size=20000):
+    """
+    Match food descriptions to the closest GI reference food
+    
+    Candidates are the GI foods sharing at least one token with the
+    description (a sparse matrix product only touches those pairs). The
+    score is the idf-weighted share of the GI name's tokens found in the
+    description; ties go to the candidate with the higher TF-IDF cosine.
+    
+    Parameters:
+    -----------
+    descriptions : Series or array-like of str
+        USDA descriptions
+    gi_index : dict
+        Output of build_gi_index()
+    min_score : float
+        Matches scoring below this are discarded
+    batch_size : int
+        Descriptions scored per sparse product (bounds memory)
+        
+    Returns:
+    --------
+    matches : DataFrame
+        gi_row (-1 if unmatched), gi_food_name, glycemic_index, score;
+        one row per description in input order
+    """
+    descriptions = list(descriptions)
+    vectorizer = gi_index['vectorizer']
+    gi_row = np.full(len(descriptions), -1, dtype=np.int64)
+    score = np.zeros(len(descriptions), dtype=np.float64)
+
+    for start in range(0, len(descriptions), batch_size):
+        tfidf = vectorizer.transform(descriptions[start:start + batch_size])
+        present = (tfidf > 0).astype(np.float64)
+
+        coverage = (present @ gi_index['coverage']).tocsr()
+        cosine = (tfidf @ gi_index['tfidf'].T).tocsr()
+        # Cosine <= 1, so scaling it down only separates near-equal coverage
+        ranked = (coverage + cosine * 1e-3).tocsr()
+
+        best = np.asarray(ranked.argmax(axis=1)).ravel()
+        rows = np.arange(len(best))
+        best_coverage = np.asarray(coverage[rows, best]).ravel()
+
+        matched = best_coverage >= min_score
+        gi_row[start:start + len(best)][matched] = best[matched]
+        score[start:start + len(best)] = best_coverage
+
+    found = gi_row >= 0
+    names = np.full(len(descriptions), None, dtype=object)
+    names[found] = gi_index['names'][gi_row[found]]
+    glycemic_index = np.full(len(descriptions), np.nan)
+    glycemic_index[found] = gi_index['glycemic_index'][gi_row[found]]
+
+    return pd.DataFrame({
+        'gi_row': gi_row,
+        'gi_food_name': names,
+        'glycemic_index': glycemic_index,
+        'score': score,
+    })
@@ -1,9 +1,26 @@
 # Placeholder for feature engineering functions
 # This module will contain functions to create derived features
 
-import pandas as pd
 import numpy as np
 
+# Nutrient inputs and derived features, in the column order the models are trained on
+BASE_FEATURES = ['total_carbs_g', 'fiber_g', 'sugar_g', 'protein_g', 'fat_g',
+                 'saturated_fat_g', 'energy_kcal', 'glycemic_index']
+DERIVED_FEATURES = ['glycemic_load', 'carb_quality_ratio', 'fat_to_carb_ratio', 'net_carbs_g',
+                    'sugar_pct_carbs', 'protein_to_carb_ratio', 'high_sugar',
+                    'low_fiber', 'high_carb']
+FEATURE_COLUMNS = BASE_FEATURES + DERIVED_FEATURES
+
+
+def _safe_ratio(numerator, denominator):
+    """numerator / denominator, 0 where the denominator is 0 or either side is missing"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    ratio = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=ratio, where=denominator != 0)
+    ratio[np.isnan(ratio)] = 0
+    return ratio if ratio.ndim else float(ratio)
+
 def calculate_glycemic_load(carbs_g, glycemic_index, serving_size_g=100):
     """
     Calculate glycemic load for a food item
@@ -42,9 +59,7 @@ def calculate_carb_quality_ratio(fiber_g, total_carbs_g):
     --------
     ratio : float
     """
-    if total_carbs_g == 0:
-        return 0
-    return fiber_g / total_carbs_g
+    return _safe_ratio(fiber_g, total_carbs_g)
 
 def calculate_fat_to_carb_ratio(fat_g, total_carbs_g):
     """
@@ -63,9 +78,219 @@ def calculate_fat_to_carb_ratio(fat_g, total_carbs_g):
     --------
     ratio : float
     """
-    if total_carbs_g == 0:
-        return 0
-    return fat_g / total_carbs_g
+    return _safe_ratio(fat_g, total_carbs_g)
+
+def estimate_glycemic_index(total_carbs_g, fiber_g, glycemic_index=None):
+    """
+    Estimate glycemic index from carbs and fiber where it is unknown
+    
+    Simplified heuristic, applied element-wise:
+    carbs < 5 -> 15, fiber/carbs > 0.15 -> 45, > 0.08 -> 60, otherwise 70.
+    Known GI values are passed through unchanged.
+    
+    Parameters:
+    -----------
+    total_carbs_g : float or array-like
+        Total carbs in grams
+    fiber_g : float or array-like
+        Fiber in grams
+    glycemic_index : float or array-like, optional
+        Known GI values; NaN where unknown
+        
+    Returns:
+    --------
+    glycemic_index : float or ndarray
+    """
+    carbs = np.asarray(total_carbs_g, dtype=np.float64)
+    fiber = np.asarray(fiber_g, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fiber_ratio = np.where(carbs > 0, fiber / carbs, 0.0)
+
+    estimate = np.select(
+        [carbs < 5, fiber_ratio > 0.15, fiber_ratio > 0.08],
+        [15.0, 45.0, 60.0],  # very low carb, high fiber, medium fiber
+        default=70.0         # low fiber = higher GI
+    )
+
+    if glycemic_index is not None:
+        known = np.asarray(glycemic_index, dtype=np.float64)
+        estimate = np.where(np.isnan(known), estimate, known)
+
+    return estimate if estimate.ndim else float(estimate)
+
+# ---------------------------------------------------------------------------
+# Feature registry: every derived feature is defined once, here
+# ---------------------------------------------------------------------------
+
+# name -> (dependencies, vectorized function taking the dependencies in order)
+FEATURE_REGISTRY = {}
+
+
+def register_feature(name, dependencies):
+    """
+    Register a derived feature computed from other features
+    
+    Parameters:
+    -----------
+    name : str
+        Feature name (column name in datasets)
+    dependencies : list of str
+        Base or derived features passed positionally to the function
+    """
+    def decorator(func):
+        FEATURE_REGISTRY[name] = (list(dependencies), func)
+        return func
+    return decorator
+
+
+@register_feature('glycemic_load', ['total_carbs_g', 'glycemic_index'])
+def _glycemic_load(total_carbs_g, glycemic_index):
+    return calculate_glycemic_load(total_carbs_g, glycemic_index)
+
+
+@register_feature('carb_quality_ratio', ['fiber_g', 'total_carbs_g'])
+def _carb_quality_ratio(fiber_g, total_carbs_g):
+    return calculate_carb_quality_ratio(fiber_g, total_carbs_g)
+
+
+@register_feature('fat_to_carb_ratio', ['fat_g', 'total_carbs_g'])
+def _fat_to_carb_ratio(fat_g, total_carbs_g):
+    return calculate_fat_to_carb_ratio(fat_g, total_carbs_g)
+
+
+@register_feature('net_carbs_g', ['total_carbs_g', 'fiber_g'])
+def _net_carbs(total_carbs_g, fiber_g):
+    return total_carbs_g - fiber_g
+
+
+@register_feature('sugar_pct_carbs', ['sugar_g', 'total_carbs_g'])
+def _sugar_pct_carbs(sugar_g, total_carbs_g):
+    return _safe_ratio(sugar_g, total_carbs_g) * 100
+
+
+@register_feature('protein_to_carb_ratio', ['protein_g', 'total_carbs_g'])
+def _protein_to_carb_ratio(protein_g, total_carbs_g):
+    return _safe_ratio(protein_g, total_carbs_g)
+
+
+@register_feature('high_sugar', ['sugar_g'])
+def _high_sugar(sugar_g):
+    return (sugar_g > 15).astype(np.int64)
+
+
+@register_feature('low_fiber', ['fiber_g'])
+def _low_fiber(fiber_g):
+    return (fiber_g < 3).astype(np.int64)
+
+
+@register_feature('high_carb', ['total_carbs_g'])
+def _high_carb(total_carbs_g):
+    return (total_carbs_g > 45).astype(np.int64)
+
+
+def resolve_features(names):
+    """
+    List the derived features needed for `names`, dependencies first
+    
+    Parameters:
+    -----------
+    names : list of str
+        Requested features (base or derived)
+        
+    Returns:
+    --------
+    order : list of str
+        Derived features to compute, in dependency order
+    """
+    order = []
+    visiting = set()
+
+    def visit(name):
+        if name in order or name not in FEATURE_REGISTRY:
+            return
+        if name in visiting:
+            raise ValueError(f"Circular feature dependency involving '{name}'")
+        visiting.add(name)
+        for dependency in FEATURE_REGISTRY[name][0]:
+            visit(dependency)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def compute_features(data, names=FEATURE_COLUMNS):
+    """
+    Compute the requested features, and only what they depend on
+    
+    Works for a single meal (dict of scalars) and for batches (DataFrame or
+    dict of arrays). Ratios are 0 where carbs are 0 or an input is missing,
+    matching the training data.
+    
+    Parameters:
+    -----------
+    data : DataFrame or dict
+        Base features as columns, arrays or scalars
+    names : list of str
+        Features to return (default: FEATURE_COLUMNS)
+        
+    Returns:
+    --------
+    features : dict
+        {name: ndarray} for every requested feature
+    """
+    values = {}
+
+    def get(name):
+        if name not in values:
+            values[name] = np.asarray(data[name], dtype=np.float64)
+        return values[name]
+
+    for name in resolve_features(names):
+        dependencies, func = FEATURE_REGISTRY[name]
+        values[name] = np.asarray(func(*[get(dep) for dep in dependencies]))
+
+    return {name: get(name) for name in names}
+
+
+def compute_meal_features(data):
+    """
+    Compute the full model feature set (FEATURE_COLUMNS)
+    
+    Parameters:
+    -----------
+    data : DataFrame or dict
+        BASE_FEATURES as columns, arrays or scalars
+        
+    Returns:
+    --------
+    features : dict
+        {name: ndarray} for every column in FEATURE_COLUMNS
+    """
+    return compute_features(data, FEATURE_COLUMNS)
+
+
+def meal_feature_matrix(data, columns=FEATURE_COLUMNS):
+    """
+    Stack meal features into a 2-D array for model input
+    
+    Parameters:
+    -----------
+    data : DataFrame or dict
+        BASE_FEATURES as columns, arrays or scalars
+    columns : list of str
+        Feature order (default: FEATURE_COLUMNS)
+        
+    Returns:
+    --------
+    X : ndarray of shape (n_meals, len(columns))
+    """
+    features = compute_features(data, columns)
+    return np.column_stack([np.atleast_1d(features[col]).astype(np.float64) for col in columns])
+
 
 def create_meal_features(df):
     """
@@ -81,16 +306,45 @@ def create_meal_features(df):
     df : DataFrame
         Dataset with added features
     """
-    df['glycemic_load'] = df.apply(
-        lambda row: calculate_glycemic_load(row['total_carbs_g'], row['glycemic_index']), 
-        axis=1
-    )
-    df['carb_quality_ratio'] = df.apply(
-        lambda row: calculate_carb_quality_ratio(row['fiber_g'], row['total_carbs_g']), 
-        axis=1
-    )
-    df['fat_to_carb_ratio'] = df.apply(
-        lambda row: calculate_fat_to_carb_ratio(row['fat_g'], row['total_carbs_g']), 
-        axis=1
-    )
+    features = compute_features(df, DERIVED_FEATURES)
+    for col in DERIVED_FEATURES:
+        df[col] = features[col]
     return df
+
+
+def create_risk_labels(data, gi_threshold=70, carbs_threshold=45, fiber_threshold=3,
+                       gl_threshold=20, carb_quality_threshold=0.1, sugar_threshold=15):
+    """
+    Create binary high-risk labels from nutritional criteria
+    
+    A meal is high risk if any of:
+    1. GI > gi_threshold and carbs > carbs_threshold and fiber < fiber_threshold
+    2. GL > gl_threshold and carb quality < carb_quality_threshold
+    3. GI > gi_threshold and sugar > sugar_threshold (the high_sugar flag)
+    
+    Parameters:
+    -----------
+    data : DataFrame or dict
+        BASE_FEATURES as columns or arrays
+    gi_threshold, carbs_threshold, fiber_threshold : float
+        Thresholds for condition 1 (gi_threshold is shared with condition 3)
+    gl_threshold, carb_quality_threshold : float
+        Thresholds for condition 2
+    sugar_threshold : float
+        Sugar (g) above which a meal counts as high sugar for condition 3
+        
+    Returns:
+    --------
+    labels : ndarray of int
+        1 for high risk, 0 otherwise
+    """
+    features = compute_features(data, ['glycemic_index', 'total_carbs_g', 'fiber_g', 'sugar_g',
+                                       'glycemic_load', 'carb_quality_ratio'])
+    high_gi = features['glycemic_index'] > gi_threshold
+
+    condition1 = (high_gi & (features['total_carbs_g'] > carbs_threshold) &
+                  (features['fiber_g'] < fiber_threshold))
+    condition2 = ((features['glycemic_load'] > gl_threshold) &
+                  (features['carb_quality_ratio'] < carb_quality_threshold))
+    condition3 = high_gi & (features['sugar_g'] > sugar_threshold)
+    return (condition1 | condition2 | condition3).astype(np.int64)
@@ -0,0 +1,574 @@
+# Model loading and prediction shared by the app and scoring tools
+# Works with the artifacts written by scripts/train_models.py
+
+import pickle
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from src.features import (BASE_FEATURES, FEATURE_COLUMNS, compute_features, create_risk_labels,
+                          estimate_glycemic_index, meal_feature_matrix)
+from src.model_export import load_exported_model
+
+# Rule scores at or below / at or above these skip the model in predict_cascade()
+CASCADE_BAND = (0.3, 0.7)
+
+# A typical mixed meal, used to warm a freshly loaded model
+WARM_UP_MEAL = {
+    'total_carbs_g': 45.0,
+    'fiber_g': 3.0,
+    'sugar_g': 5.0,
+    'protein_g': 20.0,
+    'fat_g': 10.0,
+    'saturated_fat_g': 3.0,
+    'energy_kcal': 300.0,
+    'glycemic_index': 55.0
+}
+
+
+def load_model_bundle(model_path, feature_names_path=None, n_jobs=None):
+    """
+    Load a trained model artifact
+    
+    Parameters:
+    -----------
+    model_path : str or Path
+        model.pkl holding {'model', 'scaler', 'model_type'}, or a directory
+        written by model_export.export_model() (loaded without sklearn)
+    feature_names_path : str or Path, optional
+        feature_names.pkl; defaults to the file next to model_path
+    n_jobs : int, optional
+        Override the model's own thread count for prediction (e.g. 1 when
+        callers already run predictions concurrently)
+        
+    Returns:
+    --------
+    bundle : dict
+        'model', 'scaler' (or None), 'model_type' and 'feature_names'
+    """
+    model_path = Path(model_path)
+    if model_path.is_dir():
+        model, metadata = load_exported_model(model_path)
+        return {
+            'model': model,
+            'scaler': None,  # folded into the exported model
+            'model_type': metadata['model_type'],
+            'feature_names': metadata['feature_names']
+        }
+
+    with open(model_path, 'rb') as f:
+        bundle = pickle.load(f)
+
+    if feature_names_path is None:
+        feature_names_path = model_path.parent / 'feature_names.pkl'
+    if 'features' in bundle:
+        # quick_train.py stores the feature list inside the artifact
+        feature_names = bundle['features']
+    elif Path(feature_names_path).exists():
+        with open(feature_names_path, 'rb') as f:
+            feature_names = pickle.load(f)
+    else:
+        feature_names = FEATURE_COLUMNS
+
+    model = bundle['model']
+    if n_jobs is not None and 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+
+    return {
+        'model': model,
+        'scaler': bundle.get('scaler'),
+        'model_type': bundle.get('model_type', type(bundle['model']).__name__),
+        'feature_names': list(feature_names)
+    }
+
+
+def default_model_path(directory):
+    """
+    The model the app and tools load from a directory by default
+    
+    Prefers the pickle-free export (directory/model) written by
+    train_models.py, falling back to directory/model.pkl.
+    """
+    exported = Path(directory) / 'model'
+    return exported if exported.is_dir() else Path(directory) / 'model.pkl'
+
+
+def _with_feature_names(X, estimator, feature_names):
+    """Wrap X in a DataFrame if the estimator was fitted on one, so sklearn can check the column order"""
+    if hasattr(estimator, 'feature_names_in_'):
+        return pd.DataFrame(X, columns=feature_names)
+    return X
+
+
+def predict_risk(bundle, data):
+    """
+    Predict high-risk probabilities for one or more meals
+    
+    Parameters:
+    -----------
+    bundle : dict
+        Output of load_model_bundle()
+    data : DataFrame or dict
+        BASE_FEATURES as columns, arrays or scalars
+        
+    Returns:
+    --------
+    probabilities : ndarray
+        P(high risk) per meal
+    """
+    return predict_matrix(bundle, meal_feature_matrix(data, bundle['feature_names']))
+
+
+def predict_matrix(bundle, X):
+    """
+    Predict high-risk probabilities from an already built feature matrix
+    
+    Parameters:
+    -----------
+    bundle : dict
+        Output of load_model_bundle()
+    X : ndarray of shape (n_meals, n_features)
+        Columns in bundle['feature_names'] order
+        
+    Returns:
+    --------
+    probabilities : ndarray
+        P(high risk) per row
+    """
+    feature_names = bundle['feature_names']
+    if bundle['scaler'] is not None:
+        X = bundle['scaler'].transform(_with_feature_names(X, bundle['scaler'], feature_names))
+    return bundle['model'].predict_proba(_with_feature_names(X, bundle['model'], feature_names))[:, 1]
+
+
+def rule_risk_score(data, gi_threshold=70, carbs_threshold=45, fiber_threshold=3,
+                    gl_threshold=20):
+    """
+    Additive rule-based risk score, used when no trained model is available
+    
+    +0.3 for GI > 70, +0.2 for carbs > 45, +0.2 for fiber < 3 and +0.3 for
+    glycemic load > 20, so scores are comparable with model probabilities
+    and share the risk_tier() cut-offs.
+    
+    Parameters:
+    -----------
+    data : DataFrame or dict
+        total_carbs_g, fiber_g and glycemic_index as columns, arrays or scalars
+    gi_threshold, carbs_threshold, fiber_threshold, gl_threshold : float
+        Rule thresholds
+        
+    Returns:
+    --------
+    scores : ndarray
+        Risk score in [0, 1] per meal
+    """
+    features = compute_features(data, ['glycemic_index', 'total_carbs_g', 'fiber_g',
+                                       'glycemic_load'])
+    # Added in the same order as the original scalar rules so float sums match exactly
+    score = np.where(features['glycemic_index'] > gi_threshold, 0.3, 0.0)
+    score += np.where(features['total_carbs_g'] > carbs_threshold, 0.2, 0.0)
+    score += np.where(features['fiber_g'] < fiber_threshold, 0.2, 0.0)
+    score += np.where(features['glycemic_load'] > gl_threshold, 0.3, 0.0)
+    return np.atleast_1d(score)
+
+
+def predict_cascade(bundle, data, band=CASCADE_BAND):
+    """
+    Score meals with the rules first and the model only where they are unsure
+    
+    A meal skips the model when the rule score and the nutritional labelling
+    rules (create_risk_labels, which the model is trained to reproduce) agree:
+    score <= band[0] and not labelled high risk, or score >= band[1] and
+    labelled high risk. Those meals keep their rule score as probability.
+    
+    Parameters:
+    -----------
+    bundle : dict
+        Output of load_model_bundle()
+    data : DataFrame or dict
+        BASE_FEATURES as columns, arrays or scalars
+    band : tuple of float
+        (low, high) rule scores bounding the uncertainty band
+        
+    Returns:
+    --------
+    probabilities : ndarray
+        P(high risk) per meal
+    used_model : ndarray of bool
+        True for meals the model scored
+    """
+    low, high = band
+    rule_scores = rule_risk_score(data)
+    rule_labels = create_risk_labels(data)
+    confident = (((rule_scores <= low) & (rule_labels == 0)) |
+                 ((rule_scores >= high) & (rule_labels == 1)))
+
+    probabilities = rule_scores
+    used_model = ~confident
+    if used_model.any():
+        X = meal_feature_matrix(data, bundle['feature_names'])
+        probabilities[used_model] = predict_matrix(bundle, X[used_model])
+    return probabilities, used_model
+
+
+def cascade_report(bundle, data, band=CASCADE_BAND, y_true=None, repeat=5):
+    """
+    Compare predict_cascade() with model-only scoring on the same meals
+    
+    Parameters:
+    -----------
+    bundle : dict
+        Output of load_model_bundle()
+    data : DataFrame or dict
+        BASE_FEATURES as columns or arrays, e.g. the held-out test set
+    band : tuple of float
+        Passed to predict_cascade()
+    y_true : array-like, optional
+        True labels; adds accuracy for both scorers
+    repeat : int
+        Timings are the best of this many runs
+        
+    Returns:
+    --------
+    report : dict
+        'skip_fraction', 'model_seconds', 'cascade_seconds', 'latency_saved',
+        'label_agreement' (at 0.5), 'tier_agreement', and with y_true
+        'model_accuracy' and 'cascade_accuracy'
+    """
+    def best_time(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    model_seconds, model_p = best_time(lambda: predict_risk(bundle, data))
+    cascade_seconds, (cascade_p, used_model) = best_time(lambda: predict_cascade(bundle, data, band))
+
+    report = {
+        'skip_fraction': 1 - used_model.mean(),
+        'model_seconds': model_seconds,
+        'cascade_seconds': cascade_seconds,
+        'latency_saved': 1 - cascade_seconds / model_seconds,
+        'label_agreement': np.mean((model_p > 0.5) == (cascade_p > 0.5)),
+        'tier_agreement': np.mean(risk_tiers(model_p) == risk_tiers(cascade_p))
+    }
+    if y_true is not None:
+        y_true = np.asarray(y_true)
+        report['model_accuracy'] = np.mean((model_p > 0.5) == y_true)
+        report['cascade_accuracy'] = np.mean((cascade_p > 0.5) == y_true)
+    return report
+
+
+def warm_up(bundle):
+    """
+    Run one dummy prediction so lazy initialisation happens at load time
+    
+    Parameters:
+    -----------
+    bundle : dict
+        Output of load_model_bundle()
+    """
+    predict_risk(bundle, {name: WARM_UP_MEAL[name] for name in BASE_FEATURES})
+
+
+def risk_tier(probability):
+    """
+    Map a risk probability to the tiers shown in the app
+    
+    Parameters:
+    -----------
+    probability : float
+        P(high risk)
+        
+    Returns:
+    --------
+    tier : str
+        'high' (> 0.6), 'moderate' (> 0.4) or 'low'
+    """
+    if probability > 0.6:
+        return 'high'
+    if probability > 0.4:
+        return 'moderate'
+    return 'low'
+
+
+def risk_tiers(probabilities):
+    """
+    Vectorized risk_tier()
+    
+    Parameters:
+    -----------
+    probabilities : array-like
+        P(high risk) per meal
+        
+    Returns:
+    --------
+    tiers : ndarray of str
+    """
+    p = np.asarray(probabilities, dtype=np.float64)
+    return np.select([p > 0.6, p > 0.4], ['high', 'moderate'], default='low')
+
+
+def meal_recommendations(meal):
+    """
+    Dietary suggestions for a single meal
+    
+    Parameters:
+    -----------
+    meal : dict
+        Base nutrient values for one meal
+        
+    Returns:
+    --------
+    recommendations : list of str
+        Empty when the meal looks well-balanced
+    """
+    recommendations = []
+    if meal['total_carbs_g'] > 45:
+        recommendations.append("Consider reducing portion size to lower total carbs")
+    if meal['fiber_g'] < 5:
+        recommendations.append("Add more fiber (vegetables, whole grains, legumes)")
+    if meal['glycemic_index'] > 70:
+        recommendations.append("Choose lower GI alternatives (brown rice instead of white)")
+    if meal['fat_g'] < 5 and meal['total_carbs_g'] > 30:
+        recommendations.append("Add healthy fats to slow carb absorption (nuts, avocado, olive oil)")
+    if meal['protein_g'] < 15:
+        recommendations.append("Include more protein to stabilize blood sugar")
+    return recommendations
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent prediction requests into one model call
+    
+    Callers submit feature rows from any thread and get a Future back. A
+    background thread waits up to max_wait_ms after the first pending
+    request (or until max_batch_size rows are queued), stacks everything
+    into one matrix, runs a single predict and hands each caller its slice.
+    
+    Parameters:
+    -----------
+    predict_fn : callable
+        Maps an (n_rows, n_features) array to n_rows probabilities,
+        e.g. functools.partial(predict_matrix, bundle)
+    max_batch_size : int
+        Upper bound on rows per model call
+    max_wait_ms : float
+        Longest a request waits for others to join its batch
+    """
+
+    def __init__(self, predict_fn, max_batch_size=256, max_wait_ms=2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, X):
+        """
+        Queue feature rows for prediction
+        
+        Parameters:
+        -----------
+        X : array-like of shape (n_rows, n_features) or (n_features,)
+            
+        Returns:
+        --------
+        future : concurrent.futures.Future
+            Resolves to an ndarray of n_rows probabilities
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        future = Future()
+        self._queue.put((X, future))
+        return future
+
+    def predict(self, X):
+        """Blocking form of submit()"""
+        return self.submit(X).result()
+
+    def close(self):
+        """Finish queued requests and stop the background thread"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        pending = []
+        while True:
+            item = pending.pop() if pending else self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            n_rows = len(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            while n_rows < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None or n_rows + len(item[0]) > self.max_batch_size:
+                    pending.append(item)  # shutdown marker or overflow starts the next round
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        futures = [future for _, future in batch]
+        try:
+            probabilities = np.asarray(self.predict_fn(np.vstack([X for X, _ in batch])))
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(probabilities)
+        offset = 0
+        for X, future in batch:
+            future.set_result(probabilities[offset:offset + len(X)])
+            offset += len(X)
+
+
+def _read_meal_chunks(path, columns, chunk_size):
+    """Yield DataFrames of at most chunk_size rows from a meal CSV or Parquet file"""
+    if Path(path).suffix == '.parquet':
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required to read Parquet meal logs")
+        parquet = pq.ParquetFile(path)
+        available = set(parquet.schema_arrow.names)
+        for batch in parquet.iter_batches(batch_size=chunk_size,
+                                          columns=[c for c in columns if c in available]):
+            yield batch.to_pandas()
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        yield from pd.read_csv(path, chunksize=chunk_size,
+                               usecols=[c for c in columns if c in header])
+
+
+def _score_chunk(bundle, chunk, band=None):
+    """Risk probabilities for one chunk of logged meals"""
+    missing = [name for name in BASE_FEATURES if name not in chunk and name != 'glycemic_index']
+    if missing:
+        raise ValueError(f"Meal log is missing columns: {missing}")
+
+    meals = {name: chunk[name].to_numpy(dtype=np.float64) for name in BASE_FEATURES
+             if name != 'glycemic_index'}
+    # Logged meals often lack a GI; fall back to the same estimate the pipeline uses
+    known_gi = chunk['glycemic_index'].to_numpy(dtype=np.float64) if 'glycemic_index' in chunk else None
+    meals['glycemic_index'] = estimate_glycemic_index(meals['total_carbs_g'], meals['fiber_g'], known_gi)
+    if bundle is None:
+        return rule_risk_score(meals)
+    if band is not None:
+        return predict_cascade(bundle, meals, band)[0]
+    return predict_matrix(bundle, meal_feature_matrix(meals, bundle['feature_names']))
+
+
+def score_meal_file(bundle, input_path, output_path, keep_columns=None,
+                    chunk_size=100000, cascade_band=None, progress=True):
+    """
+    Score a meal log file chunk by chunk
+    
+    Only one chunk is held in memory at a time, so files of any length can be
+    scored. Output is CSV or Parquet depending on output_path's suffix.
+    
+    Parameters:
+    -----------
+    bundle : dict or None
+        Output of load_model_bundle(); None scores with rule_risk_score()
+    input_path : str or Path
+        CSV or .parquet file with BASE_FEATURES columns (glycemic_index may
+        be missing or blank; it is then estimated)
+    output_path : str or Path
+        Destination .csv or .parquet file
+    keep_columns : list of str, optional
+        Input columns copied to the output (e.g. meal or user ids)
+    chunk_size : int
+        Rows per chunk
+    cascade_band : tuple of float, optional
+        Score with predict_cascade() using this band instead of the model alone
+    progress : bool
+        Print a line per chunk
+        
+    Returns:
+    --------
+    stats : dict
+        'rows', 'seconds', 'rows_per_second' and the count per tier
+    """
+    keep_columns = list(keep_columns or [])
+    output_path = Path(output_path)
+    to_parquet = output_path.suffix == '.parquet'
+    if to_parquet and not HAS_PYARROW:
+        raise ImportError("pyarrow is required to write Parquet output")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    writer = None
+    rows = 0
+    tier_counts = {'high': 0, 'moderate': 0, 'low': 0}
+    start = time.perf_counter()
+    try:
+        for chunk in _read_meal_chunks(input_path, keep_columns + BASE_FEATURES, chunk_size):
+            probabilities = _score_chunk(bundle, chunk, cascade_band)
+            tiers = risk_tiers(probabilities)
+
+            out = chunk[[c for c in keep_columns if c in chunk]].copy()
+            out['risk_probability'] = probabilities
+            out['risk_tier'] = tiers
+            if to_parquet:
+                table = pa.Table.from_pandas(out, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+            else:
+                out.to_csv(output_path, mode='w' if rows == 0 else 'a',
+                           header=rows == 0, index=False)
+
+            rows += len(out)
+            for tier, count in zip(*np.unique(tiers, return_counts=True)):
+                tier_counts[tier] += int(count)
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"  Scored {rows:,} rows ({rows / elapsed:,.0f} rows/s)")
+        if rows == 0:
+            empty = pd.DataFrame(columns=keep_columns + ['risk_probability', 'risk_tier'])
+            if to_parquet:
+                pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), output_path)
+            else:
+                empty.to_csv(output_path, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else float('inf'),
+        **tier_counts
+    }
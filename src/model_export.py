@@ -0,0 +1,374 @@
+# Pickle-free model export and a NumPy-only runtime for the exported models
+# Exports are written by scripts/train_models.py (or scripts/export_model.py);
+# loading them needs neither sklearn nor xgboost
+
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+EXPORT_FORMAT_VERSION = 1
+METADATA_FILE = 'model.json'
+ARRAYS_FILE = 'arrays.npz'
+XGBOOST_FILE = 'xgboost.json'
+
+
+def _forest_arrays(model):
+    """Concatenate the trees of a fitted RandomForestClassifier into flat node arrays"""
+    features, thresholds, lefts, rights, values, default_left, roots = [], [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        counts = tree.value[:, 0, :]
+        is_leaf = tree.children_left < 0
+        roots.append(offset)
+        features.append(np.where(is_leaf, -1, tree.feature))
+        thresholds.append(tree.threshold)
+        # Child ids become positions in the concatenated arrays; leaves point at themselves
+        node_ids = np.arange(tree.node_count) + offset
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+        rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+        values.append(counts[:, 1] / counts.sum(axis=1))
+        default_left.append(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)).astype(bool))
+        offset += tree.node_count
+
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'value': np.concatenate(values).astype(np.float64),
+        'default_left': np.concatenate(default_left),
+        'roots': np.array(roots, dtype=np.int32)
+    }
+
+
+def _linear_arrays(model, scaler):
+    """Coefficients of a fitted LogisticRegression plus the scaler it was trained behind"""
+    coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+    mean = np.zeros_like(coef) if scaler is None else np.asarray(scaler.mean_, dtype=np.float64)
+    scale = np.ones_like(coef) if scaler is None else np.asarray(scaler.scale_, dtype=np.float64)
+    return {
+        'mean': mean,
+        'scale': scale,
+        'coef': coef,
+        'intercept': np.asarray(model.intercept_, dtype=np.float64).ravel()
+    }
+
+
+def export_model(bundle, out_dir):
+    """
+    Write a trained model in a pickle-free format
+    
+    Logistic regression is stored as scaler and coefficient arrays, random
+    forests as flattened node arrays (both in arrays.npz) and XGBoost in its
+    native JSON format. The directory is written to a staging location and
+    renamed into place, so readers never see a half-written export.
+    
+    Parameters:
+    -----------
+    bundle : dict
+        'model', 'scaler', 'model_type' and 'feature_names', as returned by
+        inference.load_model_bundle()
+    out_dir : str or Path
+        Export directory (replaced if it exists)
+        
+    Returns:
+    --------
+    out_dir : Path
+    """
+    out_dir = Path(out_dir)
+    model = bundle['model']
+    metadata = {
+        'format_version': EXPORT_FORMAT_VERSION,
+        'model_type': bundle['model_type'],
+        'feature_names': list(bundle['feature_names'])
+    }
+
+    staging = out_dir.with_name(out_dir.name + '.tmp')
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    if hasattr(model, 'get_booster'):
+        metadata['kind'] = 'xgboost'
+        model.get_booster().save_model(str(staging / XGBOOST_FILE))
+    elif hasattr(model, 'estimators_'):
+        metadata['kind'] = 'forest'
+        np.savez(staging / ARRAYS_FILE, **_forest_arrays(model))
+    elif hasattr(model, 'coef_'):
+        metadata['kind'] = 'linear'
+        np.savez(staging / ARRAYS_FILE, **_linear_arrays(model, bundle.get('scaler')))
+    else:
+        shutil.rmtree(staging)
+        raise ValueError(f"Don't know how to export {type(model).__name__}")
+
+    if bundle.get('scaler') is not None and metadata['kind'] != 'linear':
+        shutil.rmtree(staging)
+        raise ValueError("Only linear models can be exported with a scaler")
+
+    with open(staging / METADATA_FILE, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    staging.rename(out_dir)
+    return out_dir
+
+
+def _xgboost_arrays(path):
+    """Flatten a binary:logistic booster saved as XGBoost JSON into node arrays"""
+    with open(path) as f:
+        learner = json.load(f)['learner']
+
+    objective = learner['objective']['name']
+    if objective != 'binary:logistic':
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+    # base_score is saved as '5E-1' or, since XGBoost 3, '[5E-1]'
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+
+    booster = learner['gradient_booster']['model']
+    trees = booster['trees']
+    best_iteration = learner['attributes'].get('best_iteration')
+    if best_iteration is not None:
+        # Match predict_proba, which stops at the early-stopping iteration
+        trees = trees[:int(booster['iteration_indptr'][int(best_iteration) + 1])]
+
+    features, thresholds, lefts, rights, values, default_left, roots = [], [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        left = np.asarray(tree['left_children'], dtype=np.int64)
+        right = np.asarray(tree['right_children'], dtype=np.int64)
+        split = np.asarray(tree['split_conditions'], dtype=np.float32)
+        is_leaf = left < 0
+        node_ids = np.arange(len(left)) + offset
+        roots.append(offset)
+        features.append(np.where(is_leaf, -1, tree['split_indices']))
+        thresholds.append(split)
+        lefts.append(np.where(is_leaf, node_ids, left + offset))
+        rights.append(np.where(is_leaf, node_ids, right + offset))
+        values.append(np.where(is_leaf, split, 0))  # leaves keep their weight in split_conditions
+        default_left.append(np.asarray(tree['default_left'], dtype=bool))
+        offset += len(left)
+
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'value': np.concatenate(values).astype(np.float64),
+        'default_left': np.concatenate(default_left),
+        'roots': np.array(roots, dtype=np.int32),
+        'base_margin': np.log(base_score / (1 - base_score))
+    }
+
+
+def _sigmoid(margin):
+    """1 / (1 + exp(-margin)) without overflow for large negative margins"""
+    return np.exp(-np.logaddexp(0, -margin))
+
+
+class TreeEnsemble:
+    """
+    Tree ensemble packed into contiguous arrays and evaluated level by level
+    
+    All trees live in one set of node arrays. Leaves point back at
+    themselves, so a whole batch advances through every tree in lockstep
+    for max_depth levels with a handful of vectorized gathers per level and
+    no per-tree or per-row Python loop. Rows are processed in blocks so the
+    (rows x trees) node matrix stays cache-sized.
+    
+    Thresholds are stored as float32 and adjusted so that x <= threshold
+    gives exactly the split the original library takes on float32 inputs.
+    
+    Parameters:
+    -----------
+    arrays : dict of ndarray
+        'feature' (-1 for leaves), 'threshold', 'left', 'right', 'value',
+        'default_left' and 'roots', as produced for export_model()
+    strict : bool
+        True if the library goes left on x < threshold (XGBoost), False
+        for x <= threshold (sklearn)
+    block_size : int
+        Rows evaluated together
+    """
+
+    def __init__(self, arrays, strict=False, block_size=256):
+        is_leaf = arrays['feature'] < 0
+        nodes = np.arange(len(is_leaf))
+        self.roots = arrays['roots'].astype(np.intp)
+        self.value = arrays['value'].astype(np.float64)
+        self.block_size = block_size
+
+        # Leaves become self-loops: any feature, any threshold, both children = self
+        self.feature = np.where(is_leaf, 0, arrays['feature']).astype(np.intp)
+        self.children = np.column_stack([np.where(is_leaf, nodes, arrays['left']),
+                                         np.where(is_leaf, nodes, arrays['right'])]).ravel().astype(np.intp)
+        self.default_right = ~arrays['default_left'].astype(bool)
+
+        # Largest float32 t with (x <= t) == (x <= threshold), resp. (x < threshold), for float32 x
+        threshold = np.asarray(arrays['threshold'], dtype=np.float64)
+        t32 = threshold.astype(np.float32)
+        round_down = t32.astype(np.float64) >= threshold if strict else t32.astype(np.float64) > threshold
+        self.threshold = np.where(round_down, np.nextafter(t32, np.float32(-np.inf)), t32).astype(np.float32)
+
+        # Depth of every tree; trees are ordered deepest first so that level d
+        # only has to advance the first active_trees[d] columns
+        depth = np.zeros(len(self.roots), dtype=np.intp)
+        frontier, tree = self.roots, np.arange(len(self.roots))
+        while len(frontier):
+            internal = ~is_leaf[frontier]
+            frontier, tree = frontier[internal], tree[internal]
+            depth[tree] += 1
+            frontier = np.concatenate([arrays['left'][frontier], arrays['right'][frontier]])
+            tree = np.concatenate([tree, tree])
+        order = np.argsort(-depth, kind='stable')
+        self.roots = self.roots[order]
+        self.max_depth = int(depth.max(initial=0))
+        self.active_trees = [int(np.sum(depth > level)) for level in range(self.max_depth)]
+
+    @classmethod
+    def from_sklearn(cls, model, block_size=256):
+        """Pack a fitted RandomForestClassifier (value = P(class 1) per leaf)"""
+        return cls(_forest_arrays(model), strict=False, block_size=block_size)
+
+    def leaf_values(self, X):
+        """
+        Value of the leaf each row reaches in each tree
+        
+        Parameters:
+        -----------
+        X : array-like of shape (n_rows, n_features)
+        
+        Returns:
+        --------
+        values : ndarray of shape (n_rows, n_trees)
+        """
+        X = np.ascontiguousarray(np.atleast_2d(X), dtype=np.float32)
+        n_rows, n_features = X.shape
+        has_nan = np.isnan(X).any()
+        values = np.empty((n_rows, len(self.roots)))
+
+        for start in range(0, n_rows, self.block_size):
+            block = X[start:start + self.block_size]
+            flat = block.ravel()
+            row_offset = np.arange(len(block), dtype=np.intp) * n_features
+            # Trees x rows, so the still-active (deepest) trees are a contiguous slice
+            node = np.repeat(self.roots[:, None], len(block), axis=1)
+            for n_trees in self.active_trees:
+                current = node[:n_trees]
+                x = np.take(flat, np.take(self.feature, current) + row_offset)
+                go_right = x > np.take(self.threshold, current)
+                if has_nan:
+                    go_right = np.where(np.isnan(x), np.take(self.default_right, current), go_right)
+                node[:n_trees] = np.take(self.children, 2 * current + go_right)
+            values[start:start + len(block)] = np.take(self.value, node).T
+        return values
+
+
+class ExportedModel:
+    """
+    NumPy-only scorer for a model written by export_model()
+    
+    Exposes predict_proba() like the sklearn estimators it replaces, so it
+    can stand in for bundle['model'].
+    
+    Parameters:
+    -----------
+    kind : str
+        'linear', 'forest' or 'xgboost'
+    arrays : dict of ndarray
+        Model parameters as produced by export_model()
+    """
+
+    def __init__(self, kind, arrays):
+        self.kind = kind
+        self.arrays = arrays
+        if kind != 'linear':
+            self.trees = TreeEnsemble(arrays, strict=kind == 'xgboost')
+
+    def predict_proba(self, X):
+        """
+        Class probabilities for a feature matrix
+        
+        Parameters:
+        -----------
+        X : array-like of shape (n_rows, n_features)
+        
+        Returns:
+        --------
+        probabilities : ndarray of shape (n_rows, 2)
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        a = self.arrays
+        if self.kind == 'linear':
+            margin = ((X - a['mean']) / a['scale']) @ a['coef'] + a['intercept'][0]
+            p = _sigmoid(margin)
+        elif self.kind == 'forest':
+            p = self.trees.leaf_values(X).mean(axis=1)
+        else:
+            p = _sigmoid(self.trees.leaf_values(X).sum(axis=1) + a['base_margin'])
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        """Predicted class (0 or 1) per row"""
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(np.int64)
+
+
+def load_exported_model(path):
+    """
+    Load a model written by export_model() without sklearn or xgboost
+    
+    Parameters:
+    -----------
+    path : str or Path
+        Export directory
+        
+    Returns:
+    --------
+    model : ExportedModel
+    metadata : dict
+        'model_type', 'feature_names', 'kind' and 'format_version'
+    """
+    path = Path(path)
+    with open(path / METADATA_FILE) as f:
+        metadata = json.load(f)
+    if metadata['format_version'] > EXPORT_FORMAT_VERSION:
+        raise ValueError(f"{path} uses export format {metadata['format_version']}; "
+                         f"this version reads up to {EXPORT_FORMAT_VERSION}")
+
+    if metadata['kind'] == 'xgboost':
+        arrays = _xgboost_arrays(path / XGBOOST_FILE)
+    else:
+        with np.load(path / ARRAYS_FILE, allow_pickle=False) as npz:
+            arrays = {name: npz[name] for name in npz.files}
+    return ExportedModel(metadata['kind'], arrays), metadata
+
+
+def check_export(exported, X, expected, tolerance=1e-6):
+    """
+    Compare an exported model with the original's predictions
+    
+    Parameters:
+    -----------
+    exported : ExportedModel
+        Output of load_exported_model()
+    X : ndarray of shape (n_rows, n_features)
+        Unscaled features in the exported feature order
+    expected : ndarray
+        The original model's P(high risk) for X
+    tolerance : float
+        Largest allowed absolute difference
+        
+    Returns:
+    --------
+    max_diff : float
+        Raises ValueError if it exceeds tolerance
+    """
+    actual = exported.predict_proba(X)[:, 1]
+    max_diff = float(np.max(np.abs(actual - np.asarray(expected)), initial=0.0))
+    if max_diff > tolerance:
+        raise ValueError(f"Exported model differs from the original by {max_diff:.2e} "
+                         f"(tolerance {tolerance:.0e})")
+    return max_diff
@@ -0,0 +1,306 @@
+# Content-addressed pipeline runner used by scripts/run_complete_pipeline.py
+# Stages declare their code, inputs and outputs; a stage is skipped when
+# none of them changed since its last successful run
+#
+# Stage scripts expose main(argv=None, frames=None): argv replaces the
+# command line, frames maps input paths to DataFrames already in memory, and
+# the return value maps output paths to the DataFrames written, so stages run
+# in one interpreter hand their data straight to the next one
+
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PIPELINE_STATE = PROJECT_ROOT / 'data' / 'cache' / 'pipeline_state.json'
+
+# Paths are relative to the project root. A stage depends on whichever
+# stage lists its inputs as outputs; 'code' is hashed along with 'inputs'.
+# A stage whose inputs are missing (e.g. no USDA download) is skipped.
+PIPELINE_STAGES = {
+    'sample_data': {
+        'description': 'Setting up sample data',
+        'script': 'scripts/setup_sample_data.py',
+        'code': [],
+        'inputs': [],
+        'outputs': ['data/raw/gi_table.csv', 'data/raw/sample_foods.csv']
+    },
+    'usda': {
+        'description': 'Processing USDA FoodData Central',
+        'script': 'scripts/process_usda_data.py',
+        'code': ['src/data_prep.py', 'src/features.py'],
+        'inputs': ['data/raw/food.csv', 'data/raw/food_nutrient.csv', 'data/raw/gi_table.csv'],
+        'outputs': ['data/processed/usda_foods_with_nutrition.csv',
+                    'data/processed/usda_foods_manifest.npz']
+    },
+    'features': {
+        'description': 'Feature engineering',
+        'script': 'scripts/process_features.py',
+        'code': ['src/data_prep.py', 'src/features.py'],
+        'inputs': ['data/raw/sample_foods.csv'],
+        'outputs': ['data/processed/meals_with_features.feather']
+    },
+    'train': {
+        'description': 'Training ML models',
+        'script': 'scripts/train_models.py',
+        'code': ['src/data_prep.py', 'src/features.py', 'src/inference.py',
+                 'src/model_export.py', 'src/train_model.py', 'src/tuning.py'],
+        'inputs': ['data/processed/meals_with_features.feather'],
+        'outputs': ['app/model.pkl', 'app/feature_names.pkl', 'app/model',
+                    'models/logistic_regression.pkl', 'models/random_forest.pkl',
+                    'models/xgboost.pkl', 'models/logistic_regression',
+                    'models/random_forest', 'models/xgboost']
+    }
+}
+
+
+class FileHasher:
+    """
+    SHA-256 of files and directories, reusing digests whose size and mtime
+    have not changed since they were last computed
+
+    Parameters:
+    -----------
+    known : dict, optional
+        {relative path: {'size', 'mtime_ns', 'sha256'}} from a previous run
+    """
+
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+
+    def digest(self, path, root=PROJECT_ROOT):
+        """Hex digest of a file or directory tree, or None if it does not exist"""
+        full = root / path
+        if full.is_dir():
+            combined = hashlib.sha256()
+            for child in sorted(p for p in full.rglob('*') if p.is_file()):
+                relative = child.relative_to(root).as_posix()
+                combined.update(f"{relative}\0{self.digest(relative, root)}\0".encode())
+            return combined.hexdigest()
+        if not full.is_file():
+            return None
+
+        stat = full.stat()
+        entry = self.known.get(str(path))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        digest = hashlib.sha256()
+        with open(full, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.known[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                 'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+
+def stage_dependencies(stages):
+    """{stage: set of stages producing its inputs}"""
+    producers = {output: name for name, stage in stages.items() for output in stage['outputs']}
+    return {
+        name: {producers[path] for path in stage['inputs'] if path in producers and producers[path] != name}
+        for name, stage in stages.items()
+    }
+
+
+def stage_signature(stage, hasher, root=PROJECT_ROOT):
+    """
+    Content hash of everything a stage reads: its script, code and inputs
+
+    Returns:
+    --------
+    signature : str or None
+        None if an input is missing
+    """
+    digest = hashlib.sha256(json.dumps([stage['script'], stage.get('args', [])]).encode())
+    for path in [stage['script']] + stage['code'] + stage['inputs']:
+        file_digest = hasher.digest(path, root)
+        if file_digest is None:
+            return None
+        digest.update(f"{path}\0{file_digest}\0".encode())
+    return digest.hexdigest()
+
+
+def _load_state(state_path):
+    if Path(state_path).exists():
+        with open(state_path) as f:
+            return json.load(f)
+    return {'stages': {}, 'files': {}}
+
+
+def _save_state(state, state_path):
+    state_path = Path(state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = state_path.with_suffix('.tmp')
+    with open(staging, 'w') as f:
+        json.dump(state, f, indent=2)
+    staging.replace(state_path)
+
+
+def _run_subprocess(name, stage, root):
+    """Run a stage's script in a fresh interpreter, streaming its output line by line"""
+    process = subprocess.Popen(
+        [sys.executable, str(root / stage['script'])] + stage.get('args', []),
+        cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        env={**os.environ, 'PYTHONUNBUFFERED': '1'}
+    )
+    for line in process.stdout:
+        print(f"[{name}] {line}", end='', flush=True)
+    return process.wait() == 0, {}
+
+
+def _run_in_process(name, stage, root, frames):
+    """Import a stage's script and call its main(); returns (ok, frames produced)"""
+    spec = importlib.util.spec_from_file_location(f"_pipeline_stage_{name}", root / stage['script'])
+    try:
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        produced = module.main(argv=list(stage.get('args', [])), frames=frames)
+    except SystemExit as e:
+        return e.code in (None, 0), {}
+    except Exception:
+        traceback.print_exc()
+        return False, {}
+    return True, produced or {}
+
+
+def run_pipeline(stages=PIPELINE_STAGES, state_path=PIPELINE_STATE, root=PROJECT_ROOT,
+                 force=False, workers=None, dry_run=False, in_process=True, progress=True):
+    """
+    Run the pipeline DAG, skipping stages whose inputs and code are unchanged
+
+    A stage runs once every stage it depends on has finished; independent
+    stages run concurrently. It is skipped ('cached') when its signature
+    matches the last successful run and its outputs still hash to what that
+    run produced. Per-stage timings are kept in the state file.
+    
+    In process, stages share this interpreter, so pandas, sklearn and
+    xgboost are imported once, and a stage's DataFrames reach the stages
+    after it without being read back from disk (outputs are still written,
+    they are what the cache compares). Stages then share stdout and the
+    working directory and run one at a time. Otherwise each stage is a
+    subprocess whose output is streamed with a [stage] prefix.
+
+    Parameters:
+    -----------
+    stages : dict
+        Stage definitions, see PIPELINE_STAGES
+    state_path : str or Path
+        JSON file recording signatures, output hashes and timings
+    root : Path
+        Project root the paths are relative to
+    force : bool
+        Run every stage regardless of the cache
+    workers : int, optional
+        Stages run at once (default: as many as are ready; 1 in process)
+    dry_run : bool
+        Report what would run without running it
+    in_process : bool
+        Call each stage's main() here instead of starting a subprocess
+    progress : bool
+        Print each stage's status
+
+    Returns:
+    --------
+    report : dict
+        {stage: {'status', 'seconds'}} with status 'ran', 'cached',
+        'would run', 'failed', 'blocked' (a dependency failed) or
+        'missing inputs'
+    """
+    state = _load_state(state_path)
+    hasher = FileHasher(state['files'])
+    dependencies = stage_dependencies(stages)
+    report = {}
+    frames = {}
+
+    def ready(name):
+        return all(dep in report for dep in dependencies[name])
+
+    def check(name):
+        """Status for a stage whose dependencies are done, or None if it must run"""
+        stage = stages[name]
+        if any(report[dep]['status'] in ('failed', 'blocked') for dep in dependencies[name]):
+            return 'blocked'
+        signature = stage_signature(stage, hasher, root)
+        if signature is None:
+            return 'missing inputs'
+        last = state['stages'].get(name)
+        outputs = {path: hasher.digest(path, root) for path in stage['outputs']}
+        if (not force and last and last['signature'] == signature
+                and last['outputs'] == outputs and None not in outputs.values()):
+            return 'cached'
+        return 'would run' if dry_run else None
+
+    def execute(name):
+        stage = stages[name]
+        start = time.perf_counter()
+        if in_process:
+            inputs = {path: frames[path] for path in stage['inputs'] if path in frames}
+            ok, produced = _run_in_process(name, stage, root, inputs)
+        else:
+            ok, produced = _run_subprocess(name, stage, root)
+        return ok, time.perf_counter() - start, produced
+
+    pending = list(stages)
+    running = {}
+    start = time.perf_counter()
+    previous_cwd = os.getcwd()
+    if in_process:
+        os.chdir(root)  # stage scripts resolve data/ and app/ from the working directory
+    try:
+        with ThreadPoolExecutor(max_workers=1 if in_process else workers or len(stages)) as pool:
+            while pending or running:
+                for name in [n for n in pending if ready(n)]:
+                    pending.remove(name)
+                    status = check(name)
+                    if status is not None:
+                        report[name] = {'status': status, 'seconds': 0.0}
+                        if progress:
+                            print(f"⏭  {name}: {status}")
+                        continue
+                    if progress:
+                        print(f"\n{'=' * 80}\nSTEP: {name} - {stages[name]['description']}\n{'=' * 80}\n")
+                    running[pool.submit(execute, name)] = name
+
+                if not running:
+                    if pending and not any(ready(n) for n in pending):
+                        raise ValueError(f"Pipeline has a dependency cycle among {pending}")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    ok, seconds, produced = future.result()
+                    missing = [path for path in stages[name]['outputs'] if not (root / path).exists()]
+                    if ok and missing:
+                        print(f"❌ {name} did not write {', '.join(missing)}")
+                        ok = False
+                    report[name] = {'status': 'ran' if ok else 'failed', 'seconds': seconds}
+                    if progress:
+                        print(f"\n{'✅' if ok else '❌'} {name} {'finished' if ok else 'failed'} in {seconds:.1f}s")
+                    if ok:
+                        stage = stages[name]
+                        frames.update({path: df for path, df in produced.items() if path in stage['outputs']})
+                        state['stages'][name] = {
+                            'signature': stage_signature(stage, hasher, root),
+                            'outputs': {path: hasher.digest(path, root) for path in stage['outputs']},
+                            'seconds': seconds,
+                            'finished': time.time()
+                        }
+                    else:
+                        state['stages'].pop(name, None)
+    finally:
+        os.chdir(previous_cwd)
+
+    if not dry_run:
+        state['files'] = hasher.known
+        state['last_run'] = {'seconds': time.perf_counter() - start,
+                             'stages': {name: r for name, r in report.items()}}
+        _save_state(state, state_path)
+    return report
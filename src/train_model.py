@@ -1,14 +1,18 @@
-# Placeholder for model training pipeline
-# This module will contain the main training logic
+# Model training: the candidate models and a process-pool orchestrator
+# that trains them side by side under per-model CPU budgets
+#
+# sklearn and xgboost are imported by the functions that use them, so
+# importing this module (e.g. for cpu_budgets or in a fresh pool worker)
+# does not pay for every backend up front
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-import xgboost as xgb
-import pickle
+
+CANDIDATE_MODELS = ['Logistic Regression', 'Random Forest', 'XGBoost']
 
 def prepare_training_data(df, target_column='high_risk', test_size=0.2, random_state=42):
     """
@@ -29,25 +33,39 @@ def prepare_training_data(df, target_column='high_risk', test_size=0.2, random_s
     --------
     X_train, X_test, y_train, y_test
     """
-    pass  # To be implemented
+    from sklearn.model_selection import train_test_split
 
-def train_baseline_model(X_train, y_train):
+    X = df.drop(columns=[target_column])
+    y = df[target_column]
+    return train_test_split(X, y, test_size=test_size, random_state=random_state, stratify=y)
+
+def train_baseline_model(X_train, y_train, **params):
     """
     Train logistic regression baseline
     
     Parameters:
     -----------
     X_train : array-like
-        Training features
+        Training features (already scaled)
     y_train : array-like
         Training labels
+    **params : dict
+        Hyperparameters, overriding the defaults below
         
     Returns:
     --------
     model : LogisticRegression
         Trained model
     """
-    pass  # To be implemented
+    from sklearn.linear_model import LogisticRegression
+
+    params = {
+        'random_state': 42,
+        'class_weight': 'balanced',
+        'max_iter': 1000,
+        **params
+    }
+    return LogisticRegression(**params).fit(X_train, y_train)
 
 def train_random_forest(X_train, y_train, **params):
     """
@@ -60,14 +78,468 @@ def train_random_forest(X_train, y_train, **params):
     y_train : array-like
         Training labels
     **params : dict
-        Hyperparameters
+        Hyperparameters, overriding the defaults below
         
     Returns:
     --------
     model : RandomForestClassifier
         Trained model
     """
-    pass  # To be implemented
+    from sklearn.ensemble import RandomForestClassifier
+
+    params = {
+        'n_estimators': 100,
+        'max_depth': 10,
+        'random_state': 42,
+        'class_weight': 'balanced',
+        'n_jobs': -1,
+        **params
+    }
+    return RandomForestClassifier(**params).fit(X_train, y_train)
+
+def train_xgboost(X_train, y_train, eval_set=None, **params):
+    """
+    Train XGBoost classifier, weighting positives by the class ratio
+    
+    Parameters:
+    -----------
+    X_train : array-like
+        Training features
+    y_train : array-like
+        Training labels
+    eval_set : list of (X, y), optional
+        Validation data, required with early_stopping_rounds
+    **params : dict
+        Hyperparameters, overriding the defaults below
+        
+    Returns:
+    --------
+    model : XGBClassifier
+        Trained model
+    """
+    import xgboost as xgb
+
+    y_train = np.asarray(y_train)
+    params = {
+        'n_estimators': 100,
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'random_state': 42,
+        'scale_pos_weight': (y_train == 0).sum() / (y_train == 1).sum(),
+        'eval_metric': 'logloss',
+        **params
+    }
+    return xgb.XGBClassifier(**params).fit(X_train, y_train, eval_set=eval_set, verbose=False)
+
+def cpu_budgets(n_cpus):
+    """
+    Split n_cpus between the candidate models trained side by side
+    
+    Logistic regression (lbfgs) is single-threaded, so it gets one core; the
+    forest and the booster share the rest, the forest taking the odd core
+    since its trees parallelise perfectly.
+    
+    Parameters:
+    -----------
+    n_cpus : int
+        Cores available for training
+        
+    Returns:
+    --------
+    budgets : dict
+        {model name: cores}; together they never exceed max(n_cpus, 3)
+    """
+    rest = max(n_cpus - 1, 2)
+    return {
+        'Logistic Regression': 1,
+        'Random Forest': (rest + 1) // 2,
+        'XGBoost': rest // 2
+    }
+
+def fit_candidate(name, X_train, y_train, X_test, y_test, n_jobs, params=None):
+    """
+    Train and score one candidate model using at most n_jobs cores
+    
+    Runs in a worker process when called from train_candidates(). BLAS and
+    OpenMP pools are capped as well, so numpy inside logistic regression
+    cannot grab every core behind the orchestrator's back.
+    
+    Parameters:
+    -----------
+    name : str
+        One of CANDIDATE_MODELS
+    X_train, y_train, X_test, y_test : array-like
+        Split data (scaled for logistic regression)
+    n_jobs : int
+        CPU budget
+    params : dict, optional
+        Hyperparameters (e.g. from tuning.tune_model), overriding the defaults
+        
+    Returns:
+    --------
+    result : dict
+        'model', 'n_jobs', 'fit_seconds', 'train_score', 'test_score',
+        'auc' and 'pred' (test-set predictions)
+    """
+    from sklearn.metrics import roc_auc_score
+    from threadpoolctl import threadpool_limits
+
+    params = params or {}
+    start = time.perf_counter()
+    with threadpool_limits(limits=n_jobs):
+        if name == 'Logistic Regression':
+            model = train_baseline_model(X_train, y_train, **params)
+        elif name == 'Random Forest':
+            model = train_random_forest(X_train, y_train, **{**params, 'n_jobs': n_jobs})
+            model.set_params(n_jobs=-1)  # the budget is for training only
+        elif name == 'XGBoost':
+            model = train_xgboost(X_train, y_train, **{**params, 'n_jobs': n_jobs})
+            model.set_params(n_jobs=None)
+        else:
+            raise ValueError(f"Unknown candidate model: {name}")
+    fit_seconds = time.perf_counter() - start
+
+    return {
+        'model': model,
+        'n_jobs': n_jobs,
+        'fit_seconds': fit_seconds,
+        'train_score': model.score(X_train, y_train),
+        'test_score': model.score(X_test, y_test),
+        'auc': roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]),
+        'pred': model.predict(X_test)
+    }
+
+def train_candidates(X_train, y_train, X_test, y_test, X_train_scaled=None, X_test_scaled=None,
+                     n_cpus=None, parallel=True, params=None):
+    """
+    Train all CANDIDATE_MODELS, concurrently in a process pool
+    
+    Each model gets its cpu_budgets() share, so the forest's n_jobs and the
+    booster's threads add up to the machine instead of each assuming it
+    owns it. With fewer than 3 cores (or parallel=False) the models are
+    trained one after another, each with every core.
+    
+    Parameters:
+    -----------
+    X_train, y_train, X_test, y_test : array-like
+        Split data
+    X_train_scaled, X_test_scaled : array-like, optional
+        Scaled copies for logistic regression (default: unscaled)
+    n_cpus : int, optional
+        Cores to use (default: all)
+    parallel : bool
+        Train in a process pool
+    params : dict, optional
+        {model name: hyperparameters} for fit_candidate()
+        
+    Returns:
+    --------
+    results : dict
+        {model name: fit_candidate() result}, in CANDIDATE_MODELS order
+    """
+    n_cpus = n_cpus or os.cpu_count() or 1
+    params = params or {}
+    scaled = (X_train if X_train_scaled is None else X_train_scaled,
+              X_test if X_test_scaled is None else X_test_scaled)
+    args = {
+        name: ((scaled[0], y_train, scaled[1], y_test) if name == 'Logistic Regression'
+               else (X_train, y_train, X_test, y_test))
+        for name in CANDIDATE_MODELS
+    }
+
+    if parallel and n_cpus >= 3:
+        budgets = cpu_budgets(n_cpus)
+        with ProcessPoolExecutor(max_workers=len(CANDIDATE_MODELS)) as pool:
+            futures = {name: pool.submit(fit_candidate, name, *args[name], budgets[name],
+                                         params.get(name))
+                       for name in CANDIDATE_MODELS}
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {name: fit_candidate(name, *args[name], n_cpus, params.get(name))
+                   for name in CANDIDATE_MODELS}
+    return results
+
+# ---------------------------------------------------------------------------
+# Out-of-core training: every function below takes a batch factory, a
+# callable returning a fresh iterator of (X, y) batches (e.g. a partial of
+# data_prep.iter_feature_batches), so the data is streamed once per pass
+# and never held in memory whole
+# ---------------------------------------------------------------------------
+
+def split_batches(batches, subset='train', test_size=0.2, random_state=42):
+    """
+    Streaming train/test split
+    
+    Each row goes to the test set with probability test_size. The draws
+    come from one generator seeded with random_state, so every pass over
+    the same data splits it the same way, whatever the batch size. Unlike
+    prepare_training_data() the split is not stratified, which makes no
+    difference at the sizes this is meant for.
+    
+    Parameters:
+    -----------
+    batches : iterable of (X, y)
+        One pass over the data
+    subset : str
+        'train' or 'test'
+    test_size : float
+        Expected share of rows in the test set
+    random_state : int
+        Seed of the split
+        
+    Yields:
+    -------
+    X, y : ndarray
+        The rows of each batch that belong to subset
+    """
+    rng = np.random.default_rng(random_state)
+    for X, y in batches:
+        test = rng.random(len(y)) < test_size
+        keep = test if subset == 'test' else ~test
+        if keep.any():
+            yield X[keep], y[keep]
+
+def fit_scaler_streaming(batches):
+    """
+    Fit a StandardScaler with partial_fit, counting the classes on the way
+    
+    Parameters:
+    -----------
+    batches : iterable of (X, y)
+        One pass over the training data
+        
+    Returns:
+    --------
+    scaler : StandardScaler
+        Fitted on every row
+    class_counts : ndarray
+        Rows per class (0, 1)
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    class_counts = np.zeros(2, dtype=np.int64)
+    for X, y in batches:
+        scaler.partial_fit(X)
+        class_counts += np.bincount(y, minlength=2)[:2]
+    return scaler, class_counts
+
+def train_sgd_streaming(batch_factory, scaler, class_counts, n_epochs=5, random_state=42, **params):
+    """
+    Train logistic regression with SGDClassifier.partial_fit, one batch at a time
+    
+    The streaming stand-in for train_baseline_model(): log loss, classes
+    weighted like class_weight='balanced' (which partial_fit cannot compute
+    itself), rows shuffled within each batch. On 1M synthetic meals it
+    matches lbfgs logistic regression's ROC-AUC.
+    
+    Parameters:
+    -----------
+    batch_factory : callable
+        Returns an iterator over the training batches
+    scaler : StandardScaler
+        From fit_scaler_streaming()
+    class_counts : ndarray
+        From fit_scaler_streaming()
+    n_epochs : int
+        Passes over the data
+    random_state : int
+        Seed for the model and the shuffles
+    **params : dict
+        Hyperparameters, overriding the defaults below
+        
+    Returns:
+    --------
+    model : SGDClassifier
+        Trained model, expects scaled features
+    """
+    from sklearn.linear_model import SGDClassifier
+
+    weights = class_counts.sum() / (2 * np.maximum(class_counts, 1))
+    params = {
+        'loss': 'log_loss',
+        'alpha': 1e-4,
+        'learning_rate': 'adaptive',  # steady on small data, unlike the default 'optimal'
+        'eta0': 0.01,
+        'class_weight': {0: weights[0], 1: weights[1]},
+        'random_state': random_state,
+        **params
+    }
+    model = SGDClassifier(**params)
+    rng = np.random.default_rng(random_state)
+    for _ in range(n_epochs):
+        for X, y in batch_factory():
+            order = rng.permutation(len(y))
+            model.partial_fit(scaler.transform(X[order]), y[order], classes=[0, 1])
+    return model
+
+def train_xgboost_streaming(batch_factory, class_counts, cache_dir=None, **params):
+    """
+    Train XGBoost from batches through its external-memory DataIter interface
+    
+    XGBoost pulls the batches itself and keeps only their quantised pages,
+    on disk under cache_dir, so memory stays bounded by the batch size.
+    Defaults match train_xgboost().
+    
+    Parameters:
+    -----------
+    batch_factory : callable
+        Returns an iterator over the training batches
+    class_counts : ndarray
+        From fit_scaler_streaming(), for scale_pos_weight
+    cache_dir : str or Path, optional
+        Where XGBoost keeps its page cache (default: a temporary directory)
+    **params : dict
+        Hyperparameters (sklearn names: n_estimators, max_depth, ...),
+        overriding the defaults below
+        
+    Returns:
+    --------
+    model : XGBClassifier
+        Trained model
+    """
+    import tempfile
+    import xgboost as xgb
+
+    class BatchIter(xgb.DataIter):
+        def __init__(self, prefix):
+            self._batches = None
+            super().__init__(cache_prefix=prefix)
+
+        def next(self, input_data):
+            if self._batches is None:
+                self._batches = batch_factory()
+            batch = next(self._batches, None)
+            if batch is None:
+                return False
+            input_data(data=batch[0], label=batch[1])
+            return True
+
+        def reset(self):
+            self._batches = None
+
+    params = {
+        'n_estimators': 100,
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'random_state': 42,
+        'scale_pos_weight': class_counts[0] / max(class_counts[1], 1),
+        **params
+    }
+    booster_params = {
+        'objective': 'binary:logistic',
+        'eval_metric': 'logloss',
+        'tree_method': 'hist',
+        'max_depth': params.pop('max_depth'),
+        'eta': params.pop('learning_rate'),
+        'seed': params.pop('random_state'),
+        **params
+    }
+    n_rounds = booster_params.pop('n_estimators')
+
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp:
+        batches = BatchIter(str(Path(tmp) / 'xgb'))
+        # ExtMemQuantileDMatrix is the external-memory matrix since XGBoost 3.0
+        if hasattr(xgb, 'ExtMemQuantileDMatrix'):
+            dtrain = xgb.ExtMemQuantileDMatrix(batches)
+        else:
+            dtrain = xgb.DMatrix(batches)
+        booster = xgb.train(booster_params, dtrain, num_boost_round=n_rounds)
+        del dtrain
+
+    model = xgb.XGBClassifier()
+    model.load_model(bytearray(booster.save_raw('json')))
+    return model
+
+def sample_batches(batches, n_rows, random_state=42):
+    """
+    Uniform random sample of at most n_rows rows from a stream of batches
+    
+    For models without partial_fit (the random forest): every row gets a
+    random key and the n_rows smallest keys seen so far are kept, so memory
+    is bounded by n_rows plus one batch.
+    
+    Parameters:
+    -----------
+    batches : iterable of (X, y)
+        One pass over the data
+    n_rows : int
+        Sample size
+    random_state : int
+        Seed for the keys
+        
+    Returns:
+    --------
+    X, y : ndarray
+        The sample
+    """
+    rng = np.random.default_rng(random_state)
+    X_keep = y_keep = keys = None
+    for X, y in batches:
+        batch_keys = rng.random(len(y))
+        if keys is None:
+            X_keep, y_keep, keys = X, y, batch_keys
+        else:
+            X_keep, y_keep = np.vstack([X_keep, X]), np.concatenate([y_keep, y])
+            keys = np.concatenate([keys, batch_keys])
+        if len(keys) > n_rows:
+            keep = np.argpartition(keys, n_rows)[:n_rows]
+            X_keep, y_keep, keys = X_keep[keep], y_keep[keep], keys[keep]
+    return X_keep, y_keep
+
+def evaluate_streaming(model, batches, scaler=None, bins=4000, max_log_odds=20.0):
+    """
+    Accuracy, confusion matrix and ROC-AUC of a model over a stream of batches
+    
+    Predictions are counted into log-odds bins per class instead of kept, so
+    memory does not grow with the test set. ROC-AUC is exact up to ties
+    within a bin; log-odds keep confident predictions (p near 0 or 1)
+    apart, where probability bins would lump them together.
+    
+    Parameters:
+    -----------
+    model : classifier
+        Anything with predict_proba
+    batches : iterable of (X, y)
+        One pass over the test data
+    scaler : StandardScaler, optional
+        Applied first (for the SGD model)
+    bins : int
+        Log-odds bins for ROC-AUC
+    max_log_odds : float
+        Log-odds beyond +/- this share the outermost bins
+        
+    Returns:
+    --------
+    scores : dict
+        'n_rows', 'accuracy', 'auc' and 'confusion' (2x2, rows actual)
+    """
+    confusion = np.zeros((2, 2), dtype=np.int64)
+    histograms = np.zeros((2, bins), dtype=np.int64)
+    for X, y in batches:
+        if scaler is not None:
+            X = scaler.transform(X)
+        proba = model.predict_proba(X)[:, 1]
+        y = y.astype(np.int64)
+        np.add.at(confusion, (y, (proba >= 0.5).astype(np.int64)), 1)
+        with np.errstate(divide='ignore'):
+            log_odds = np.clip(np.log(proba) - np.log1p(-proba), -max_log_odds, max_log_odds)
+        slot = np.minimum(((log_odds + max_log_odds) / (2 * max_log_odds) * bins).astype(np.int64), bins - 1)
+        for label in (0, 1):
+            histograms[label] += np.bincount(slot[y == label], minlength=bins)
+
+    # P(score of a positive > score of a negative), ties counted half
+    negatives, positives = histograms
+    below = np.cumsum(negatives) - negatives
+    pairs = negatives.sum() * positives.sum()
+    auc = ((positives * below).sum() + 0.5 * (positives * negatives).sum()) / pairs if pairs else np.nan
+    n_rows = confusion.sum()
+    return {
+        'n_rows': int(n_rows),
+        'accuracy': np.trace(confusion) / n_rows if n_rows else np.nan,
+        'auc': auc,
+        'confusion': confusion
+    }
 
 def save_model(model, preprocessor, model_path, preprocessor_path):
     """
@@ -0,0 +1,189 @@
+# Hyperparameter search for the candidate models in src/train_model.py
+# Successive halving over training-set size, cross-validation folds in
+# parallel, XGBoost early stopping, and a resumable on-disk cache
+
+import hashlib
+import json
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+
+from src.train_model import train_baseline_model, train_random_forest, train_xgboost
+
+# Grids searched by tune_model(); XGBoost's n_estimators is an upper bound
+# that early stopping cuts short
+SEARCH_SPACES = {
+    'Logistic Regression': {
+        'C': [0.001, 0.01, 0.1, 1.0, 10.0, 100.0]
+    },
+    'Random Forest': {
+        'max_depth': [4, 6, 8, 10, 14, None],
+        'n_estimators': [50, 100, 200]
+    },
+    'XGBoost': {
+        'learning_rate': [0.03, 0.1, 0.3],
+        'max_depth': [3, 4, 6, 8],
+        'n_estimators': [1000]
+    }
+}
+
+EARLY_STOPPING_ROUNDS = 30
+VALIDATION_FRACTION = 0.15
+
+
+def _fit(name, X_train, y_train, params, random_state):
+    """Fit one candidate single-threaded (folds are what run in parallel)"""
+    if name == 'Logistic Regression':
+        return train_baseline_model(X_train, y_train, **params), None
+    if name == 'Random Forest':
+        return train_random_forest(X_train, y_train, n_jobs=1, **params), None
+
+    # Carve a validation split out of the training fold for early stopping
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=VALIDATION_FRACTION, random_state=random_state, stratify=y_train
+    )
+    model = train_xgboost(X_fit, y_fit, n_jobs=1, early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                          eval_set=[(X_val, y_val)], **params)
+    return model, model.best_iteration + 1
+
+
+def _score_fold(name, X, y, train_idx, test_idx, params, random_state):
+    """ROC-AUC on one cross-validation fold, plus the boosting rounds used"""
+    model, n_rounds = _fit(name, X[train_idx], y[train_idx], params, random_state)
+    return roc_auc_score(y[test_idx], model.predict_proba(X[test_idx])[:, 1]), n_rounds
+
+
+def _data_fingerprint(X, y):
+    """Short content hash of the training data, part of every cache key"""
+    digest = hashlib.sha1(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _load_cache(cache_path):
+    """{key: record} from a JSON-lines tuning cache; a torn last line is ignored"""
+    cache = {}
+    if cache_path is not None and Path(cache_path).exists():
+        with open(cache_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # interrupted mid-write
+                cache[record['key']] = record
+    return cache
+
+
+def tune_model(name, X, y, cache_path=None, eta=3, cv=3, n_jobs=None, random_state=42,
+               progress=True):
+    """
+    Successive-halving search over SEARCH_SPACES[name], scored by ROC-AUC
+    
+    Every candidate is cross-validated on a small stratified subsample; the
+    best 1/eta go on to a subsample eta times larger, until the survivors
+    are evaluated on all of X. Folds run in parallel. XGBoost candidates
+    stop early on a validation split carved out of each training fold, and
+    the tuned n_estimators is the mean number of rounds they kept.
+    
+    Each evaluation is appended to cache_path as soon as it finishes, keyed
+    by model, parameters, subsample size, cv and a hash of the data, so an
+    interrupted search resumes where it stopped and a repeated one is free.
+    
+    Parameters:
+    -----------
+    name : str
+        Key of SEARCH_SPACES
+    X : array-like of shape (n_rows, n_features)
+        Training features (scaled for logistic regression)
+    y : array-like
+        Training labels
+    cache_path : str or Path, optional
+        JSON-lines cache file
+    eta : int
+        Halving rate
+    cv : int
+        Cross-validation folds
+    n_jobs : int, optional
+        Folds fitted in parallel (joblib convention; default: all cores)
+    random_state : int
+        Seed for subsamples, folds and validation splits
+    progress : bool
+        Print one line per rung
+        
+    Returns:
+    --------
+    result : dict
+        'params' (best, ready for train_model), 'score' (CV ROC-AUC on all
+        rows), 'evaluations' and 'cached' (how many came from the cache)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    candidates = list(ParameterGrid(SEARCH_SPACES[name]))
+    fingerprint = _data_fingerprint(X, y)
+    cache = _load_cache(cache_path)
+    if cache_path is not None:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # The last rung compares at most eta survivors on every row
+    n_rungs = max(1, math.ceil(math.log(len(candidates), eta)))
+    min_samples = max(len(y) // eta ** (n_rungs - 1), 10 * cv)
+    evaluations = cached = 0
+
+    with Parallel(n_jobs=n_jobs if n_jobs is not None else -1) as parallel:
+        for rung in range(n_rungs):
+            n_samples = len(y) if rung == n_rungs - 1 else min(len(y), min_samples * eta ** rung)
+            if n_samples < len(y):
+                rows, _ = train_test_split(np.arange(len(y)), train_size=n_samples,
+                                           random_state=random_state, stratify=y)
+            else:
+                rows = np.arange(len(y))
+            folds = list(StratifiedKFold(cv, shuffle=True, random_state=random_state).split(rows, y[rows]))
+
+            scored = []
+            for params in candidates:
+                key = hashlib.sha1(json.dumps(
+                    [name, params, int(n_samples), cv, random_state, fingerprint],
+                    sort_keys=True, default=str).encode()).hexdigest()
+                if key in cache:
+                    record = cache[key]
+                    cached += 1
+                else:
+                    fold_results = parallel(
+                        delayed(_score_fold)(name, X[rows], y[rows], train_idx, test_idx,
+                                             params, random_state)
+                        for train_idx, test_idx in folds
+                    )
+                    rounds = [n for _, n in fold_results if n is not None]
+                    record = {
+                        'key': key,
+                        'model': name,
+                        'params': params,
+                        'n_samples': int(n_samples),
+                        'score': float(np.mean([score for score, _ in fold_results])),
+                        'n_rounds': int(round(np.mean(rounds))) if rounds else None,
+                        'time': time.time()
+                    }
+                    if cache_path is not None:
+                        with open(cache_path, 'a') as f:
+                            f.write(json.dumps(record, default=str) + '\n')
+                    cache[key] = record
+                evaluations += 1
+                scored.append(record)
+
+            scored.sort(key=lambda r: -r['score'])
+            keep = len(scored) if rung == n_rungs - 1 else max(1, math.ceil(len(scored) / eta))
+            if progress:
+                print(f"   {name}: rung {rung + 1}/{n_rungs}, {len(scored)} candidates on "
+                      f"{n_samples} rows, best AUC {scored[0]['score']:.3f}")
+            candidates = [r['params'] for r in scored[:keep]]
+
+    best = scored[0]
+    params = dict(best['params'])
+    if best['n_rounds'] is not None:
+        params['n_estimators'] = best['n_rounds']
+    return {'params': params, 'score': best['score'], 'evaluations': evaluations, 'cached': cached}
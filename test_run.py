@@ -2,6 +2,7 @@ import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from src.features import DERIVED_FEATURES, create_meal_features, create_risk_labels
 
 print("Python executable:", sys.executable, flush=True)
 print("Python version:", sys.version, flush=True)
@@ -24,28 +25,12 @@ try:
     
     # Create features
     print(f"\nCreating derived features...", flush=True)
-    df['glycemic_load'] = (df['glycemic_index'] * df['total_carbs_g']) / 100
-    df['carb_quality_ratio'] = df['fiber_g'] / df['total_carbs_g'].replace(0, np.nan)
-    df['carb_quality_ratio'].fillna(0, inplace=True)
-    df['fat_to_carb_ratio'] = df['fat_g'] / df['total_carbs_g'].replace(0, np.nan)
-    df['fat_to_carb_ratio'].fillna(0, inplace=True)
-    df['net_carbs_g'] = df['total_carbs_g'] - df['fiber_g']
-    df['sugar_pct_carbs'] = (df['sugar_g'] / df['total_carbs_g'].replace(0, np.nan)) * 100
-    df['sugar_pct_carbs'].fillna(0, inplace=True)
-    df['protein_to_carb_ratio'] = df['protein_g'] / df['total_carbs_g'].replace(0, np.nan)
-    df['protein_to_carb_ratio'].fillna(0, inplace=True)
-    df['high_sugar'] = (df['sugar_g'] > 15).astype(int)
-    df['low_fiber'] = (df['fiber_g'] < 3).astype(int)
-    df['high_carb'] = (df['total_carbs_g'] > 45).astype(int)
-    print(f"✓ Created 9 derived features", flush=True)
+    df = create_meal_features(df)
+    print(f"✓ Created {len(DERIVED_FEATURES)} derived features", flush=True)
     
     # Create risk labels
     print(f"\nCreating risk labels...", flush=True)
-    df['high_risk'] = (
-        ((df['glycemic_index'] > 70) & (df['total_carbs_g'] > 45) & (df['fiber_g'] < 3)) |
-        ((df['glycemic_load'] > 20) & (df['carb_quality_ratio'] < 0.1)) |
-        ((df['glycemic_index'] > 70) & (df['high_sugar'] == 1))
-    ).astype(int)
+    df['high_risk'] = create_risk_labels(df)
     
     high_risk_count = df['high_risk'].sum()
     low_risk_count = (~df['high_risk'].astype(bool)).sum()